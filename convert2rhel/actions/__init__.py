@@ -18,16 +18,19 @@ __metaclass__ = type
 
 import abc
 import collections
+import heapq
 import importlib
-import itertools
 import logging
 import pkgutil
 import traceback
 
 from functools import wraps
+from operator import attrgetter
 
 import six
 
+from six.moves import intern
+
 from convert2rhel import utils
 
 
@@ -74,6 +77,16 @@ STATUS_CODE = {
     "ERROR": 202,
 }
 
+#: The integer values of :data:`STATUS_CODE` bound to names.  Use these when
+#: comparing levels in code; :data:`STATUS_CODE` is for looking up a level by
+#: its symbolic name.
+STATUS_SUCCESS = STATUS_CODE["SUCCESS"]
+STATUS_INFO = STATUS_CODE["INFO"]
+STATUS_WARNING = STATUS_CODE["WARNING"]
+STATUS_SKIP = STATUS_CODE["SKIP"]
+STATUS_OVERRIDABLE = STATUS_CODE["OVERRIDABLE"]
+STATUS_ERROR = STATUS_CODE["ERROR"]
+
 #: Maps status names back from an integer code.  Used for constructing log
 #: messages and information for the user.
 _STATUS_NAME_FROM_CODE = dict((value, key) for key, value in STATUS_CODE.items())
@@ -151,27 +164,49 @@ class DependencyError(ActionError):
 FinishedActions = collections.namedtuple("FinishedActions", ("successes", "failures", "skips"))
 
 
-@six.add_metaclass(abc.ABCMeta)
+class _ActionMeta(abc.ABCMeta):
+    """
+    Metaclass for :class:`Action`.
+
+    :attr:`Action.id` is a plain class attribute rather than an abstract
+    property so that reading it does not go through a descriptor.  An Action
+    which does not set it is still treated as abstract and cannot be
+    instantiated.
+
+    The ids and dependencies are interned when the class is created.  They are
+    hashed and compared against each other whenever the Actions are ordered
+    and run.
+    """
+
+    def __new__(mcs, name, bases, namespace):
+        cls = super(_ActionMeta, mcs).__new__(mcs, name, bases, namespace)
+
+        if not hasattr(cls, "id"):
+            cls.__abstractmethods__ = frozenset(cls.__abstractmethods__.union(("id",)))
+        elif isinstance(namespace.get("id"), str):
+            cls.id = intern(cls.id)
+
+        if "dependencies" in namespace:
+            cls.dependencies = tuple(intern(d) if isinstance(d, str) else d for d in cls.dependencies)
+
+        return cls
+
+
+@six.add_metaclass(_ActionMeta)
 class Action:
-    """Base class for writing a check."""
-
-    # Once we can limit to Python3-3.3+ we can use this instead:
-    # @property
-    # @abc.abstractmethod
-    # def id(self):
-    @abc.abstractproperty  # pylint: disable=deprecated-decorator
-    def id(self):
-        """
-        This should be replaced by a simple class attribute.
-        It is a short string that uniquely identifies the Action.
-        For instance::
-            class Convert2rhelLatest(Action):
-                id = "C2R_LATEST"
-
-        `id` will be combined with `error_code` from the exception parameter
-        list to create a unique key per error that can be used by other tools
-        to tell what went wrong.
-        """
+    """
+    Base class for writing a check.
+
+    Subclasses must set :attr:`id` as a class attribute.  It is a short string
+    that uniquely identifies the Action.  For instance::
+
+        class Convert2rhelLatest(Action):
+            id = "C2R_LATEST"
+
+    `id` will be combined with `error_code` from the exception parameter
+    list to create a unique key per error that can be used by other tools
+    to tell what went wrong.
+    """
 
     #: Override dependencies with a Sequence that contains other
     #: :class:`Action`\ s :attr:`Action.id`\ s that must be run before this one.
@@ -363,7 +398,7 @@ class ActionMessage(ActionMessageBase):
 
         # None of the result status codes are legal as a message.  So we error if any
         # of them were given here.
-        if not (STATUS_CODE["SUCCESS"] < STATUS_CODE[level] < STATUS_CODE["SKIP"]):
+        if not (STATUS_SUCCESS < STATUS_CODE[level] < STATUS_SKIP):
             raise InvalidMessageError("Invalid level '%s', set for a non-result message" % level)
 
         super(ActionMessage, self).__init__(level, id, title, description, diagnosis, remediations, variables)
@@ -385,12 +420,12 @@ class ActionResult(ActionMessageBase):
         if not id:
             raise InvalidMessageError("Results require the id field")
 
-        if STATUS_CODE[level] >= STATUS_CODE["SKIP"]:
+        if STATUS_CODE[level] >= STATUS_SKIP:
             if not (level and title and description):
                 # id is placed in the error message so it is less confusing for the user
                 raise InvalidMessageError("Non-success results require level, title and description fields")
 
-        elif STATUS_CODE["SUCCESS"] < STATUS_CODE[level] < STATUS_CODE["SKIP"]:
+        elif STATUS_SUCCESS < STATUS_CODE[level] < STATUS_SKIP:
             raise InvalidMessageError(
                 "Invalid level '%s', the level for result must be SKIP or more fatal or SUCCESS." % level
             )
@@ -398,6 +433,12 @@ class ActionResult(ActionMessageBase):
         super(ActionResult, self).__init__(level, id, title, description, diagnosis, remediations, variables)
 
 
+#: Cache of the Actions found by :func:`get_actions`.  Importing every module
+#: in a package is expensive and the Actions we ship do not change while we
+#: are running so we only want to do it once for each path and prefix.
+_ACTIONS_CACHE = {}
+
+
 def get_actions(actions_path, prefix):
     """
     Determine the list of actions that exist at a path.
@@ -429,7 +470,14 @@ def get_actions(actions_path, prefix):
     .. seealso:: :func:`pkgutil.iter_modules`
         Consult :func:`pkgutil.iter_modules` for more information on
         actions_path and prefix which we pass verbatim to that function.
+
+    .. note:: The result is cached per actions_path and prefix.  A new set is
+        returned on each call so callers are free to modify it.
     """
+    cache_key = (tuple(actions_path), prefix)
+    if cache_key in _ACTIONS_CACHE:
+        return set(_ACTIONS_CACHE[cache_key])
+
     actions = set()
 
     # In Python 3, this is a NamedTuple where m[1] == m.name and m[2] == m.ispkg
@@ -437,12 +485,21 @@ def get_actions(actions_path, prefix):
     modules = (importlib.import_module(m) for m in modules)
 
     for module in modules:
-        objects = (getattr(module, obj_name) for obj_name in dir(module))
+        # Only consider the classes defined in this module.  Actions imported
+        # from somewhere else belong to the module that defines them.
+        objects = vars(module).values()
         action_classes = (
-            obj for obj in objects if isinstance(obj, type) and issubclass(obj, Action) and obj is not Action
+            obj
+            for obj in objects
+            if isinstance(obj, type)
+            and issubclass(obj, Action)
+            and obj is not Action
+            and obj.__module__ == module.__name__
         )
         actions.update(action_classes)
 
+    _ACTIONS_CACHE[cache_key] = frozenset(actions)
+
     return actions
 
 
@@ -481,6 +538,31 @@ class Stage:
         python_package = importlib.import_module(self._actions_dir % self.stage_name)
         self.actions = get_actions(python_package.__path__, python_package.__name__ + ".")
 
+        # The Actions in a Stage don't change once it is created so we only
+        # need to sort them into dependency order once.  See _resolve_order().
+        self._resolved_actions = None
+
+    def _resolve_order(self, previously_resolved_actions=None):
+        """
+        Sort the Actions in this Stage into the order in which they need to run.
+
+        The order is computed the first time this is called and then cached on
+        the Stage so that :meth:`check_dependencies` and :meth:`run` do not
+        each have to perform the sort.
+
+        :param previously_resolved_actions: Actions from previous Stages which
+            have already been resolved into dependency order.
+        :type previously_resolved_actions: Sequence
+        :raises DependencyError: when there is an unresolvable dependency in
+            the set of actions.
+        :returns: Actions of this Stage in the order that they should be run.
+        :rtype: tuple
+        """
+        if self._resolved_actions is None:
+            self._resolved_actions = tuple(resolve_action_order(self.actions, previously_resolved_actions))
+
+        return self._resolved_actions
+
     def check_dependencies(self, _previous_stage_actions=None):
         """
         Make sure dependencies of this Stage and previous stages are satisfied.
@@ -493,9 +575,13 @@ class Stage:
         :raises DependencyError: when there is an unresolvable dependency in
             the set of actions.
         """
+        if _previous_stage_actions is None:
+            _previous_stage_actions = []
+
         # We want to throw an exception if one of the actions fails to resolve
-        # its deps.  We don't care about the return value here.
-        actions_so_far = list(resolve_action_order(self.actions, _previous_stage_actions))
+        # its deps.  The resolved order is cached so that run() can reuse it.
+        actions_so_far = list(_previous_stage_actions)
+        actions_so_far.extend(self._resolve_order(_previous_stage_actions))
 
         if self.next_stage:
             self.next_stage.check_dependencies(actions_so_far)
@@ -520,27 +606,49 @@ class Stage:
             running is WARNING or better (WARNING or SUCCESS) and
             failure as worse than WARNING (OVERRIDABLE, ERROR)
         """
-        logger.task("Prepare: %s" % self.task_header)
-
-        if self._has_run:
-            raise ActionError("Stage %s has already run." % self.stage_name)
-        self._has_run = True
-
         # Make a mutable copy of these parameters so we don't overwrite the caller's data.
         # If they weren't passed in, default to an empty list.
         successes = [] if successes is None else list(successes)
         failures = [] if failures is None else list(failures)
         skips = [] if skips is None else list(skips)
 
+        # The lists are ours now so each Stage in the chain can append to
+        # them directly instead of making its own copy.
+        stage = self
+        while stage:
+            stage._run_actions(successes, failures, skips)
+            stage = stage.next_stage
+
+        return FinishedActions(successes, failures, skips)
+
+    def _run_actions(self, successes, failures, skips):
+        """
+        Run the actions in this Stage, appending them to the lists passed in.
+
+        :param successes: Actions which have run and succeeded.
+        :type successes: list
+        :param failures: Actions which have run and failed.
+        :type failures: list
+        :param skips: Actions which have been skipped.
+        :type skips: list
+        """
+        logger.task("Prepare: %s" % self.task_header)
+
+        if self._has_run:
+            raise ActionError("Stage %s has already run." % self.stage_name)
+        self._has_run = True
+
         # When testing for failed dependencies, we need the Action ids of failures and skips so
         # record those separately
         failed_action_ids = set()
 
-        for action_class in resolve_action_order(
-            self.actions, previously_resolved_actions=successes + failures + skips
-        ):
-            # Decide if we need to skip because deps have failed
-            failed_deps = [d for d in action_class.dependencies if d in failed_action_ids]
+        for action_class in self._resolve_order(previously_resolved_actions=successes + failures + skips):
+            # Decide if we need to skip because deps have failed.  Most of the
+            # time nothing has failed so check that with a single set operation
+            # before building the (ordered) list of failed deps for the message.
+            failed_deps = []
+            if not failed_action_ids.isdisjoint(action_class.dependencies):
+                failed_deps = [d for d in action_class.dependencies if d in failed_action_ids]
 
             action = action_class()
 
@@ -584,23 +692,16 @@ class Stage:
                 )
 
             # Categorize the results
-            if action.result.level <= STATUS_CODE["WARNING"]:
-                logger.info("%s has succeeded" % action.id)
+            result = action.result
+            if result.level <= STATUS_WARNING:
+                logger.info("%s has succeeded", action.id)
                 successes.append(action)
-
-            if action.result.level > STATUS_CODE["WARNING"]:
-                message = format_action_status_message(
-                    action.result.level, action.id, action.result.id, action.result.to_dict()
-                )
+            else:
+                message = format_action_status_message(result.level, action.id, result.id, result.to_dict())
                 logger.error(message)
                 failures.append(action)
                 failed_action_ids.add(action.id)
 
-        if self.next_stage:
-            successes, failures, skips = self.next_stage.run(successes, failures, skips)
-
-        return FinishedActions(successes, failures, skips)
-
 
 def resolve_action_order(potential_actions, previously_resolved_actions=None):
     """
@@ -630,62 +731,86 @@ def resolve_action_order(potential_actions, previously_resolved_actions=None):
     # Sort the potential actions before processing so that the dependency
     # order is stable. (Always yields the same order if the input and
     # algorithm has not changed)
-    potential_actions = sorted(potential_actions, key=lambda action: action.id)
+    potential_actions = sorted(potential_actions, key=attrgetter("id"))
+
+    # When none of the Actions have dependencies the sorted order is the final
+    # order so there's no need to build the dependency graph.
+    if not any(action.dependencies for action in potential_actions):
+        for action in potential_actions:
+            yield action
+        return
 
     # We have pre-sorted action by their id so that there is a stable sort order.
     # Now we have to sort them further so that dependencies are run before
     # the Actions which depend upon them.
+    #
+    # This is a topological sort (Kahn's algorithm).  We count the unresolved
+    # dependencies of each Action and record which Actions depend on each id.
+    # Whenever an Action is resolved, the counts of the Actions which depend on
+    # it are decremented and those which reach zero become ready to run.
 
-    # Actions which have yet to be resolved.  A resolved Action has been sorted
-    # into its final order and yielded to the caller.
-    unresolved_actions = []
     # ids of the actions which have already been resolved
     resolved_action_ids = set(action.id for action in previously_resolved_actions)
 
-    for action in potential_actions:
+    # Number of dependencies which are still unresolved for each Action.  The
+    # Actions are referred to by their position in potential_actions.
+    unresolved_dependency_counts = []
+    # Maps an Action id to the positions of the Actions which depend on it
+    dependents = collections.defaultdict(list)
+
+    # Queue of (pass, position) for the Actions which are ready to run.  The
+    # pass emulates scanning the unresolved Actions in sorted order over and
+    # over: Actions without any dependencies are yielded first (pass 0) and an
+    # Action which becomes ready while an Action sorted before it is resolved
+    # has to wait for the next pass.  This keeps the order stable.
+    ready_actions = []
+
+    for position, action in enumerate(potential_actions):
+        unresolved_dependencies = set(action.dependencies).difference(resolved_action_ids)
+        unresolved_dependency_counts.append(len(unresolved_dependencies))
+
+        for dependency in unresolved_dependencies:
+            dependents[dependency].append(position)
+
         if not action.dependencies:
             # No dependencies so we can perform this immediately.
-            resolved_action_ids.add(action.id)
-            yield action
-        else:
-            # There are dependencies so we will have to make sure that its
-            # dependencies have been been run first.
-            unresolved_actions.append(action)
-
-    # Add the length of all actions passed in together.  We decide whether
-    # we're done sorting by comparing the previous unresolved actions to the
-    # current number of unresolved_actions so we want this to be more than the
-    # length of unresolved_actions to start with.
-    previous_number_of_unresolved_actions = len(potential_actions) + len(previously_resolved_actions)
-
-    # Keep trying to sort the actions until we haven't resolved any actions
-    # since the last iteration of the while loop (each while loop examines
-    # all of the unresolved actions once)
-    while previous_number_of_unresolved_actions != len(unresolved_actions):
-        previous_number_of_unresolved_actions = len(unresolved_actions)
-
-        # Examine each action.  (Utilize a copy of unresolved_actions for the
-        # loop since we add to unresolved_actions inside of the loop)
-        for action in unresolved_actions[:]:
-            # We can only run the action if all of its dependencies have
-            # previously been run
-            if all(d in resolved_action_ids for d in action.dependencies):
-                # Mark the action as being sorted by removing it from the
-                # list of unresolved actions and adding its id to the set of
-                # resolved actions.
-                unresolved_actions.remove(action)
-                resolved_action_ids.add(action.id)
-
-                # Yield the action so that it will be run now.
-                yield action
-
-    # After exiting the while loop we know that we cannot run anymore actions
+            ready_actions.append((0, position))
+        elif not unresolved_dependencies:
+            # All dependencies were resolved before we were called.
+            ready_actions.append((1, position))
+
+    heapq.heapify(ready_actions)
+
+    while ready_actions:
+        current_pass, position = heapq.heappop(ready_actions)
+        action = potential_actions[position]
+
+        # Mark the action as being sorted and yield it so that it will be run now.
+        resolved_action_ids.add(action.id)
+        yield action
+
+        # Only the first Action with a given id satisfies the dependency so
+        # pop the dependents to make sure that they are only decremented once.
+        for dependent in dependents.pop(action.id, ()):
+            unresolved_dependency_counts[dependent] -= 1
+            if unresolved_dependency_counts[dependent]:
+                continue
+
+            if current_pass and dependent > position:
+                heapq.heappush(ready_actions, (current_pass, dependent))
+            else:
+                heapq.heappush(ready_actions, (current_pass + 1, dependent))
+
+    # After the queue is drained we know that we cannot run anymore actions
     # because there are no more whose dependencies have all been run.  If
     # there are any actions which are still unresolved at this point, it means
     # that some of them have unsatisfied dependencies.  This could mean the
     # dependencies aren't present, there was a typo in a dependency id, or
     # that there is a circular dependency that needs to be broken.
-    if previous_number_of_unresolved_actions != 0:
+    unresolved_actions = [
+        action for position, action in enumerate(potential_actions) if unresolved_dependency_counts[position]
+    ]
+    if unresolved_actions:
         raise DependencyError(
             "Unsatisfied dependencies in these actions: %s" % ", ".join(action.id for action in unresolved_actions)
         )
@@ -720,9 +845,10 @@ def parse_action_results(results):
     :rtype: dict[str, dict[str, list | dict]]
     """
     formatted_results = {}
-    for action in itertools.chain(*results):
-        msgs = [msg.to_dict() for msg in action.messages]
-        formatted_results[action.id] = {"messages": msgs, "result": action.result.to_dict()}
+    for finished_actions in results:
+        for action in finished_actions:
+            msgs = [msg.to_dict() for msg in action.messages]
+            formatted_results[action.id] = {"messages": msgs, "result": action.result.to_dict()}
     return formatted_results
 
 
@@ -813,7 +939,8 @@ def find_actions_of_severity(results, severity, key):
         # matched_actions will contain all actions which were skipped
         # or failed while running.
     """
-    matched_actions = [message for message in results.items() if key(message[1]) >= STATUS_CODE[severity]]
+    threshold = STATUS_CODE[severity]
+    matched_actions = [message for message in results.items() if key(message[1]) >= threshold]
     return matched_actions
 
 
@@ -840,7 +967,7 @@ def format_action_status_message(status_code, action_id, id, result):
     # we can output a simple message with the addition of the `No further
     # information given` and return earlier to skip the other conditionals
     # checks.
-    if status_code == STATUS_CODE["SUCCESS"]:
+    if status_code == STATUS_SUCCESS:
         template += " {MESSAGE}"
         return template.format(ID=id, LEVEL=level_name, ACTION_ID=action_id, MESSAGE=default_message)
 
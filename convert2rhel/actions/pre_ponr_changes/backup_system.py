@@ -201,12 +201,12 @@ class BackupPackageFiles(actions.Action):
 
     def _parse_line(self, line):
         """Return {"status":"S5T", "file_type":"c", "path":"/etc/yum.repos.d/CentOS-Linux-AppStream.repo"}"""
-        match = re.match(RPM_VA_REGEX, line)
+        match = RPM_VA_REGEX.match(line)
 
         if not match:  # line not matching the regex
             if line.strip() != "":
                 # Line is not empty string
-                loggerinst.debug("Skipping invalid output %s" % line)
+                loggerinst.debug("Skipping invalid output %s", line)
             return {"status": None, "file_type": None, "path": None}
 
         line = line.split()
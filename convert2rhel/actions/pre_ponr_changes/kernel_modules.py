@@ -31,6 +31,9 @@ logger = logging.getLogger(__name__)
 
 LINK_PREVENT_KMODS_FROM_LOADING = "https://access.redhat.com/solutions/41278"
 
+# Match the module name at the start of each line of lsmod output
+LSMOD_MODULE_NAME_REGEX = re.compile(r"^(\w+)\s.+$", re.MULTILINE)
+
 
 class RHELKernelModuleNotFound(Exception):
     pass
@@ -54,7 +57,7 @@ class EnsureKernelModulesCompatibility(actions.Action):
         """
         logger.debug("Getting a list of loaded kernel modules.")
         lsmod_output, _ = run_subprocess(["/usr/sbin/lsmod"], print_output=False)
-        modules = re.findall(r"^(\w+)\s.+$", lsmod_output, flags=re.MULTILINE)[1:]
+        modules = LSMOD_MODULE_NAME_REGEX.findall(lsmod_output)[1:]
         kernel_modules = [
             self._get_kmod_comparison_key(
                 run_subprocess(["/usr/sbin/modinfo", "-F", "filename", module], print_output=False)[0]
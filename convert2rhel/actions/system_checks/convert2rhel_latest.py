@@ -18,6 +18,8 @@ __metaclass__ = type
 import logging
 import os.path
 
+from functools import cmp_to_key
+
 import rpm
 
 from convert2rhel import __file__ as convert2rhel_file
@@ -76,10 +78,11 @@ class Convert2rhelLatest(actions.Action):
 
         raw_output_convert2rhel_versions = _extract_convert2rhel_versions(raw_output_convert2rhel_versions)
 
-        latest_available_version = ("0", "0.00", "0")
-        convert2rhel_versions = []
+        # The (epoch, version, release) of each package, ex: ("0", "0.26", "1.el7").
+        # Start with a version that every real package is newer than.
+        convert2rhel_versions = [("0", "0.00", "0")]
 
-        # add each tuple of fields obtained from parse_pkg_string() to convert2rhel_versions
+        # add the epoch, version and release obtained from parse_pkg_string() to convert2rhel_versions
         for raw_pkg in raw_output_convert2rhel_versions:
             try:
                 parsed_pkg = parse_pkg_string(raw_pkg)
@@ -87,27 +90,17 @@ class Convert2rhelLatest(actions.Action):
                 # Not a valid package string input
                 logger.debug(exc)
                 continue
-            convert2rhel_versions.append(parsed_pkg)
-
-        logger.debug("Found %s convert2rhel package(s)" % len(convert2rhel_versions))
-
-        # This loop will determine the latest available convert2rhel version in the yum repo.
-        # It assigns the epoch, version, and release ex: ("0", "0.26", "1.el7") to the latest_available_version variable.
-        for package_version in convert2rhel_versions:
-            logger.debug("...comparing version %s" % latest_available_version[1])
-            # rpm.labelCompare(pkg1, pkg2) compare two package version strings and return
-            # -1 if latest_version is greater than package_version, 0 if they are equal, 1 if package_version is greater than latest_version
-            ver_compare = rpm.labelCompare(
-                (package_version[1], package_version[2], package_version[3]), latest_available_version
-            )
+            convert2rhel_versions.append((parsed_pkg[1], parsed_pkg[2], parsed_pkg[3]))
 
-            if ver_compare > 0:
-                logger.debug(
-                    "...found %s to be newer than %s, updating" % (package_version[2], latest_available_version[1])
-                )
-                latest_available_version = (package_version[1], package_version[2], package_version[3])
+        logger.debug("Found %s convert2rhel package(s)", len(convert2rhel_versions) - 1)
+
+        # Determine the latest available convert2rhel version in the yum repo.
+        # rpm.labelCompare(pkg1, pkg2) compares two (epoch, version, release)
+        # tuples and returns -1, 0 or 1 like a cmp function so we can use it
+        # as the sort key.  max() keeps the first of equal versions.
+        latest_available_version = max(convert2rhel_versions, key=cmp_to_key(rpm.labelCompare))
 
-        logger.debug("Found %s to be latest available version" % (latest_available_version[1]))
+        logger.debug("Found %s to be latest available version", latest_available_version[1])
         precise_available_version = ("0", latest_available_version[1], "0")
         precise_convert2rhel_version = ("0", running_convert2rhel_version, "0")
         # Get source files that we're running with import convert2rhel ; convert2rhel.__file__
@@ -275,7 +268,7 @@ def _extract_convert2rhel_versions(raw_versions):
             # Mainly for debugging purposes to see what is happening if we got
             # anything else that does not have the C2R identifier at the start
             # of the line.
-            logger.debug("Got a line without the C2R identifier: %s" % raw_version)
+            logger.debug("Got a line without the C2R identifier: %s", raw_version)
     precise_raw_version = parsed_versions
 
     return precise_raw_version
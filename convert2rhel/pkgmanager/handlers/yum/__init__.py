@@ -61,7 +61,7 @@ def _resolve_yum_problematic_dependencies(output):
         loggerinst.debug("Dependency resolution failed with no detailed message reported by yum.")
 
     for package in output:
-        resolve_error = re.findall(EXTRACT_PKG_FROM_YUM_DEPSOLVE, str(package))
+        resolve_error = EXTRACT_PKG_FROM_YUM_DEPSOLVE.findall(str(package))
         if resolve_error:
             # The first string to appear in index 0 is the package we want.
             packages_to_remove.append(str(resolve_error[0]).replace(" ", ""))
@@ -18,6 +18,7 @@
 __metaclass__ = type
 
 import logging
+import os
 import tempfile
 
 from contextlib import closing
@@ -139,13 +140,18 @@ def write_temporary_repofile(contents):
             description="Failed to create a temporary directory for storing a repository file under %s.\n"
             "Reason: %s" % (TMP_DIR, str(err)),
         )
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".repo", delete=False, dir=repofile_dir) as f:
-        try:
-            store_content_to_file(filename=f.name, content=contents)
-            return f.name
-        except (OSError, IOError) as err:
-            raise exceptions.CriticalError(
-                id_="STORE_REPOFILE_FAILED",
-                title="Failed to store a repository file",
-                description="Failed to write a repository file contents to %s.\n" "Reason: %s" % (f.name, str(err)),
-            )
+
+    # We only need a unique name for the repofile; store_content_to_file()
+    # opens the file itself so close the descriptor mkstemp() gives us.
+    fd, repofile_path = tempfile.mkstemp(suffix=".repo", dir=repofile_dir)
+    os.close(fd)
+
+    try:
+        store_content_to_file(filename=repofile_path, content=contents)
+        return repofile_path
+    except (OSError, IOError) as err:
+        raise exceptions.CriticalError(
+            id_="STORE_REPOFILE_FAILED",
+            title="Failed to store a repository file",
+            description="Failed to write a repository file contents to %s.\n" "Reason: %s" % (repofile_path, str(err)),
+        )
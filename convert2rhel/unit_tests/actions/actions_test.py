@@ -18,22 +18,86 @@
 __metaclass__ = type
 
 import os.path
+import pkgutil
 import re
 
-from collections import defaultdict
+from collections import Counter, deque, namedtuple
+from operator import attrgetter
 
 import pytest
 import six
 
 
 six.add_move(six.MovedModule("mock", "mock", "unittest.mock"))
-from six.moves import mock
+from six.moves import intern, mock
 
 from convert2rhel import actions
-from convert2rhel.actions import STATUS_CODE, ActionMessage, ActionMessageBase, ActionResult, InvalidMessageError
+from convert2rhel.actions import (
+    STATUS_CODE,
+    STATUS_ERROR,
+    STATUS_INFO,
+    STATUS_OVERRIDABLE,
+    STATUS_SKIP,
+    STATUS_SUCCESS,
+    STATUS_WARNING,
+    ActionMessage,
+    ActionMessageBase,
+    ActionResult,
+    InvalidMessageError,
+)
 from convert2rhel.main import level_for_raw_action_data
 
 
+#: Directory holding the packages of Actions used as test data
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+
+#: Matches the definition of an Action subclass in the source of a module
+ACTION_CLASS_DEFINITION_RE = re.compile(r"^class .+\([^)]*Action\):$", re.MULTILINE)
+
+
+ShippedActions = namedtuple("ShippedActions", ("computed", "filesystem_count"))
+
+
+@pytest.fixture(scope="module")
+def shipped_actions():
+    """
+    Scan the Actions we ship a single time for all the tests in this module.
+
+    :returns: ShippedActions with the Actions that get_actions() finds in each
+        of the subpackages of convert2rhel.actions and the number of Action
+        classes defined in the source files there.
+    """
+    computed_actions = []
+
+    # Is this method of finding how many Action plugins we ship too hacky?
+    filesystem_detected_actions_count = 0
+    find_action_classes = ACTION_CLASS_DEFINITION_RE.finditer
+    actions_dir = os.path.dirname(actions.__file__)
+    for rootdir, dirnames, filenames in os.walk(actions_dir):
+        # The stages are flat packages and get_actions() is non-recursive so
+        # there's no need to look further down than the stage directories.
+        if rootdir != actions_dir:
+            dirnames[:] = []
+
+        for directory in dirnames:
+            if "%s.%s." % (actions.__name__, directory) == "convert2rhel.actions.post_ponr":
+                continue
+
+            # Add to the actions that the production code finds here as it is non-recursive
+            computed_actions.extend(
+                actions.get_actions([os.path.join(rootdir, directory)], "%s.%s." % (actions.__name__, directory))
+            )
+
+        for filename in filenames:
+            if not filename.endswith(".py") or filename == "__init__.py":
+                continue
+
+            with open(os.path.join(rootdir, filename)) as f:
+                filesystem_detected_actions_count += sum(1 for _ in find_action_classes(f.read()))
+
+    return ShippedActions(computed_actions, filesystem_detected_actions_count)
+
+
 class _ActionForTesting(actions.Action):
     """Fake Action class where we can set all of the attributes as we like."""
 
@@ -42,14 +106,27 @@ class _ActionForTesting(actions.Action):
     def __init__(self, **kwargs):
         super(_ActionForTesting, self).__init__()
 
-        for attr_name, attr_value in kwargs.items():
-            setattr(self, attr_name, attr_value)
+        # result is a property which validates its value so it has to go through setattr
+        if "result" in kwargs:
+            self.result = kwargs.pop("result")
+
+        self.__dict__.update(kwargs)
 
     def run(self):
         super(_ActionForTesting, self).run()
         pass
 
 
+def _make_actions(action_specs):
+    """
+    Create the Actions for a test from (id, dependencies) pairs.
+
+    Parametrize tables hold the pairs so that the Actions are only created
+    when the test which needs them is run.
+    """
+    return [_ActionForTesting(id=action_id, dependencies=dependencies) for action_id, dependencies in action_specs]
+
+
 class TestAction:
     """Tests across all of the Actions we ship."""
 
@@ -107,7 +184,7 @@ class TestAction:
         ("level", "id"),
         (
             ("FOOBAR", "FOOBAR"),
-            (actions.STATUS_CODE["ERROR"], "ERROR_ID"),
+            (actions.STATUS_ERROR, "ERROR_ID"),
         ),
     )
     def test_set_results_bad_level(self, level, id):
@@ -116,20 +193,44 @@ class TestAction:
         with pytest.raises(KeyError):
             action.set_result(level=level, id=id)
 
-    def test_no_duplicate_ids(self):
+    def test_no_duplicate_ids(self, shipped_actions):
         """Test that each Action has its own unique id."""
-        computed_actions = actions.get_actions(actions.__path__, actions.__name__ + ".")
+        computed_actions = shipped_actions.computed
+        duplicated_ids = [
+            action_id for action_id, count in Counter(action.id for action in computed_actions).items() if count > 1
+        ]
+
+        # The message is only built when the assertion fails
+        assert not duplicated_ids, "\n".join(
+            "%s is present in more than one location: %s"
+            % (action_id, ", ".join(str(action) for action in computed_actions if action.id == action_id))
+            for action_id in duplicated_ids
+        )
+
+    def test_action_without_id_is_abstract(self):
+        """Test that an Action has to set its id before it can be used."""
 
-        action_id_locations = defaultdict(list)
-        for action in computed_actions:
-            action_id_locations[action.id].append(str(action))
+        class _ActionWithoutId(actions.Action):
+            def run(self):
+                pass
 
-        dupe_actions = []
-        for action_id, locations in action_id_locations.items():
-            if len(locations) > 1:
-                dupe_actions.append("%s is present in more than one location: %s" % (action_id, ", ".join(locations)))
+        with pytest.raises(TypeError, match="abstract"):
+            _ActionWithoutId()
 
-        assert not dupe_actions, "\n".join(dupe_actions)
+    def test_ids_and_dependencies_are_interned(self):
+        """Test that the ids of an Action class are interned when it is created."""
+
+        class _InternedAction(actions.Action):
+            # Build the strings at runtime so the compiler doesn't intern them
+            id = "".join(("INTERNED", "-ACTION"))
+            dependencies = ["".join(("OTHER", "-ACTION"))]
+
+            def run(self):
+                pass
+
+        assert _InternedAction.id is intern("INTERNED-ACTION")
+        assert _InternedAction.dependencies == ("OTHER-ACTION",)
+        assert _InternedAction.dependencies[0] is intern("OTHER-ACTION")
 
     def test_actions_cannot_be_run_twice(self):
         """Test that an Action can only be run once."""
@@ -179,7 +280,7 @@ class TestAction:
             actual_messages.append(msg.to_dict())
         assert actual_messages == [
             {
-                "level": STATUS_CODE["WARNING"],
+                "level": STATUS_WARNING,
                 "id": "WARNING_ID",
                 "title": "warning message 1",
                 "description": "action warning",
@@ -188,7 +289,7 @@ class TestAction:
                 "variables": {},
             },
             {
-                "level": STATUS_CODE["WARNING"],
+                "level": STATUS_WARNING,
                 "id": "WARNING_ID",
                 "title": "warning message 2",
                 "description": "action warning",
@@ -197,7 +298,7 @@ class TestAction:
                 "variables": {},
             },
             {
-                "level": STATUS_CODE["INFO"],
+                "level": STATUS_INFO,
                 "id": "INFO_ID",
                 "title": "info message 1",
                 "description": "action info",
@@ -206,7 +307,7 @@ class TestAction:
                 "variables": {},
             },
             {
-                "level": STATUS_CODE["INFO"],
+                "level": STATUS_INFO,
                 "id": "INFO_ID",
                 "title": "info message 2",
                 "description": "action info",
@@ -218,37 +319,34 @@ class TestAction:
 
 
 class TestGetActions:
-    ACTION_CLASS_DEFINITION_RE = re.compile(r"^class .+\([^)]*Action\):$", re.MULTILINE)
-
-    def test_get_actions_smoketest(self):
+    def test_get_actions_smoketest(self, shipped_actions):
         """Test that there are no errors loading the Actions we ship."""
-        computed_actions = []
+        assert len(shipped_actions.computed) == shipped_actions.filesystem_count
 
-        # Is this method of finding how many Action plugins we ship too hacky?
-        filesystem_detected_actions_count = 0
-        for rootdir, dirnames, filenames in os.walk(os.path.dirname(actions.__file__)):
-            for directory in dirnames:
-                if "%s.%s." % (actions.__name__, directory) == "convert2rhel.actions.post_ponr":
-                    continue
+    def test_get_actions_no_dupes(self, shipped_actions):
+        """Test that there are no duplicates in the list of returned Actions."""
+        computed_actions = shipped_actions.computed
 
-                # Add to the actions that the production code finds here as it is non-recursive
-                computed_actions.extend(
-                    actions.get_actions([os.path.join(rootdir, directory)], "%s.%s." % (actions.__name__, directory))
-                )
+        assert len(computed_actions) == len(frozenset(computed_actions))
 
-            for filename in (os.path.join(rootdir, filename) for filename in filenames):
-                if filename.endswith(".py") and not filename.endswith("/__init__.py"):
-                    with open(filename) as f:
-                        action_classes = self.ACTION_CLASS_DEFINITION_RE.findall(f.read())
-                        filesystem_detected_actions_count += len(action_classes)
+    def test_get_actions_cached(self, sys_path, monkeypatch):
+        """The modules at a path are only scanned once."""
+        monkeypatch.setattr(actions, "_ACTIONS_CACHE", {})
+        iter_modules_mock = mock.Mock(side_effect=pkgutil.iter_modules)
+        monkeypatch.setattr(pkgutil, "iter_modules", iter_modules_mock)
 
-        assert len(computed_actions) == filesystem_detected_actions_count
+        if DATA_DIR not in sys_path:
+            sys_path.insert(0, DATA_DIR)
+        test_data = os.path.join(DATA_DIR, "multiple_actions_one_file")
+        prefix = "convert2rhel.unit_tests.actions.data.multiple_actions_one_file."
 
-    def test_get_actions_no_dupes(self):
-        """Test that there are no duplicates in the list of returned Actions."""
-        computed_actions = actions.get_actions(actions.__path__, actions.__name__ + ".")
+        first = actions.get_actions([test_data], prefix)
+        # Modifying the returned set must not change what is cached
+        first.clear()
+        second = actions.get_actions([test_data], prefix)
 
-        assert len(computed_actions) == len(frozenset(computed_actions))
+        assert Counter(m.__name__ for m in second) == Counter(["RealTest", "SecondTest"])
+        assert iter_modules_mock.call_count == 1
 
     def test_no_actions(self, tmpdir):
         """No Actions returns an empty list."""
@@ -271,18 +369,19 @@ class TestGetActions:
             ("multiple_actions_multiple_files", ["TestAction1", "TestAction2"]),
             ("not_action_itself", ["RealTest", "OtherTest"]),
             ("only_subclasses_of_action", ["RealTest"]),
+            ("imported_action", ["OwnTest"]),
         ),
     )
     def test_found_actions(self, sys_path, test_dir_name, expected_action_names):
         """Set of Actions that we have generated is found."""
-        data_dir = os.path.join(os.path.dirname(__file__), "data")
-        sys_path.insert(0, data_dir)
-        test_data = os.path.join(data_dir, test_dir_name)
-        computed_action_names = sorted(
+        if DATA_DIR not in sys_path:
+            sys_path.insert(0, DATA_DIR)
+        test_data = os.path.join(DATA_DIR, test_dir_name)
+        computed_action_names = Counter(
             m.__name__
             for m in actions.get_actions([test_data], "convert2rhel.unit_tests.actions.data.%s." % test_dir_name)
         )
-        assert computed_action_names == sorted(expected_action_names)
+        assert computed_action_names == Counter(expected_action_names)
 
 
 @pytest.fixture
@@ -407,6 +506,17 @@ class TestStage:
         assert sorted(action.id for action in actual.failures) == sorted(expected[1])
         assert sorted(action.id for action in actual.skips) == sorted(expected[2])
 
+    def test_resolved_order_is_cached(self, stage_actions, monkeypatch):
+        """Test that check_dependencies() and run() share the resolved order."""
+        resolve_action_order_mock = mock.Mock(side_effect=actions.resolve_action_order)
+        monkeypatch.setattr(actions, "resolve_action_order", resolve_action_order_mock)
+
+        stage = actions.Stage("good_deps1")
+        stage.check_dependencies()
+        stage.run()
+
+        assert resolve_action_order_mock.call_count == 1
+
     def test_stages_cannot_be_run_twice(self, stage_actions):
         """Test that an Action can only be run once."""
         stage = actions.Stage("good_deps1")
@@ -421,21 +531,21 @@ class TestResolveActionOrder:
         ("potential_actions", "ordered_result"),
         (
             ([], []),
-            ([_ActionForTesting(id="One")], ["One"]),
+            ([("One", ())], ["One"]),
             (
-                [_ActionForTesting(id="One"), _ActionForTesting(id="Two", dependencies=("One",))],
+                [("One", ()), ("Two", ("One",))],
                 ["One", "Two"],
             ),
             (
-                [_ActionForTesting(id="Two"), _ActionForTesting(id="One", dependencies=("Two",))],
+                [("Two", ()), ("One", ("Two",))],
                 ["Two", "One"],
             ),
             (
                 [
-                    _ActionForTesting(id="One"),
-                    _ActionForTesting(id="Two", dependencies=("One",)),
-                    _ActionForTesting(id="Three", dependencies=("Two",)),
-                    _ActionForTesting(id="Four", dependencies=("Three",)),
+                    ("One", ()),
+                    ("Two", ("One",)),
+                    ("Three", ("Two",)),
+                    ("Four", ("Three",)),
                 ],
                 ["One", "Two", "Three", "Four"],
             ),
@@ -444,55 +554,47 @@ class TestResolveActionOrder:
             # still stable.
             (
                 [
-                    _ActionForTesting(id="One"),
-                    _ActionForTesting(id="Two", dependencies=("One",)),
-                    _ActionForTesting(
-                        id="Three",
-                        dependencies=(
-                            "Two",
-                            "One",
-                        ),
-                    ),
-                    _ActionForTesting(id="Four", dependencies=("Three",)),
+                    ("One", ()),
+                    ("Two", ("One",)),
+                    ("Three", ("Two", "One")),
+                    ("Four", ("Three",)),
                 ],
                 ["One", "Two", "Three", "Four"],
             ),
             (
                 [
-                    _ActionForTesting(id="One"),
-                    _ActionForTesting(id="Two", dependencies=("One",)),
-                    _ActionForTesting(id="Three", dependencies=("Two",)),
-                    _ActionForTesting(
-                        id="Four",
-                        dependencies=(
-                            "One",
-                            "Three",
-                        ),
-                    ),
+                    ("One", ()),
+                    ("Two", ("One",)),
+                    ("Three", ("Two",)),
+                    ("Four", ("One", "Three")),
                 ],
                 ["One", "Two", "Three", "Four"],
             ),
             (
                 [
-                    _ActionForTesting(id="One"),
-                    _ActionForTesting(id="Two", dependencies=("One",)),
-                    _ActionForTesting(id="Three", dependencies=("Two",)),
-                    _ActionForTesting(
-                        id="Four",
-                        dependencies=(
-                            "Three",
-                            "One",
-                        ),
-                    ),
+                    ("One", ()),
+                    ("Two", ("One",)),
+                    ("Three", ("Two",)),
+                    ("Four", ("Three", "One")),
                 ],
                 ["One", "Two", "Three", "Four"],
             ),
         ),
+        ids=(
+            "empty",
+            "single",
+            "one_then_two",
+            "two_then_one",
+            "chain",
+            "multiple_deps",
+            "multiple_deps_first_before_last",
+            "multiple_deps_last_before_first",
+        ),
     )
     def test_one_solution(self, potential_actions, ordered_result):
         """Resolve order when only one solutions satisfies dependencies."""
-        computed_actions = actions.resolve_action_order(potential_actions)
-        computed_action_ids = [action.id for action in computed_actions]
+        computed_actions = actions.resolve_action_order(_make_actions(potential_actions))
+        computed_action_ids = list(map(attrgetter("id"), computed_actions))
         assert computed_action_ids == ordered_result
 
     # Note: Each of these sets of Actions have multiple solutions but
@@ -506,10 +608,10 @@ class TestResolveActionOrder:
         (
             (
                 [
-                    _ActionForTesting(id="One"),
-                    _ActionForTesting(id="Two", dependencies=("One",)),
-                    _ActionForTesting(id="Three", dependencies=("One",)),
-                    _ActionForTesting(id="Four", dependencies=("Three",)),
+                    ("One", ()),
+                    ("Two", ("One",)),
+                    ("Three", ("One",)),
+                    ("Four", ("Three",)),
                 ],
                 (
                     # ["One", "Two", "Three", "Four"],
@@ -518,10 +620,10 @@ class TestResolveActionOrder:
             ),
             (
                 [
-                    _ActionForTesting(id="One"),
-                    _ActionForTesting(id="Two", dependencies=("One",)),
-                    _ActionForTesting(id="Three", dependencies=("One",)),
-                    _ActionForTesting(id="Four", dependencies=("One",)),
+                    ("One", ()),
+                    ("Two", ("One",)),
+                    ("Three", ("One",)),
+                    ("Four", ("One",)),
                 ],
                 (
                     # ["One", "Two", "Three", "Four"],
@@ -534,10 +636,10 @@ class TestResolveActionOrder:
             ),
             (
                 [
-                    _ActionForTesting(id="One"),
-                    _ActionForTesting(id="Two"),
-                    _ActionForTesting(id="Three", dependencies=("One",)),
-                    _ActionForTesting(id="Four", dependencies=("Two",)),
+                    ("One", ()),
+                    ("Two", ()),
+                    ("Three", ("One",)),
+                    ("Four", ("Two",)),
                 ],
                 (
                     # ["One", "Two", "Three", "Four"],
@@ -550,16 +652,10 @@ class TestResolveActionOrder:
             ),
             (
                 [
-                    _ActionForTesting(id="One"),
-                    _ActionForTesting(
-                        id="Two",
-                        dependencies=(
-                            "One",
-                            "Three",
-                        ),
-                    ),
-                    _ActionForTesting(id="Three", dependencies=("One",)),
-                    _ActionForTesting(id="Four", dependencies=("Three",)),
+                    ("One", ()),
+                    ("Two", ("One", "Three")),
+                    ("Three", ("One",)),
+                    ("Four", ("Three",)),
                 ],
                 (
                     ["One", "Three", "Two", "Four"],
@@ -568,9 +664,9 @@ class TestResolveActionOrder:
             ),
             (
                 [
-                    _ActionForTesting(id="One"),
-                    _ActionForTesting(id="Two"),
-                    _ActionForTesting(id="Three"),
+                    ("One", ()),
+                    ("Two", ()),
+                    ("Three", ()),
                 ],
                 (
                     # ["One", "Two", "Three"],
@@ -582,6 +678,7 @@ class TestResolveActionOrder:
                 ),
             ),
         ),
+        ids=("two_after_one", "three_after_one", "two_roots", "mixed_deps", "no_deps"),
     )
     def test_multiple_solutions(self, potential_actions, possible_orders):
         """
@@ -590,8 +687,8 @@ class TestResolveActionOrder:
         This test both checks that the order is correct and that the sort is
         stable (it doesn't change between runs or on different distributionss).
         """
-        computed_actions = actions.resolve_action_order(potential_actions)
-        computed_action_ids = [action.id for action in computed_actions]
+        computed_actions = actions.resolve_action_order(_make_actions(potential_actions))
+        computed_action_ids = list(map(attrgetter("id"), computed_actions))
         assert computed_action_ids in possible_orders
 
     @pytest.mark.parametrize(
@@ -600,143 +697,194 @@ class TestResolveActionOrder:
             # Dependencies that don't exist
             (
                 [
-                    _ActionForTesting(id="One", dependencies=("Unknown",)),
+                    ("One", ("Unknown",)),
                 ],
             ),
             (
                 [
-                    _ActionForTesting(id="One", dependencies=("Unknown",)),
-                    _ActionForTesting(id="Two", dependencies=("One",)),
+                    ("One", ("Unknown",)),
+                    ("Two", ("One",)),
                 ],
             ),
             (
                 [
-                    _ActionForTesting(id="One"),
-                    _ActionForTesting(id="Two", dependencies=("One",)),
-                    _ActionForTesting(id="Two", dependencies=("Unknown",)),
+                    ("One", ()),
+                    ("Two", ("One",)),
+                    ("Two", ("Unknown",)),
                 ],
             ),
             # Circular deps
             (
                 [
-                    _ActionForTesting(id="One"),
-                    _ActionForTesting(id="Two", dependencies=("Three",)),
-                    _ActionForTesting(id="Three", dependencies=("Two",)),
+                    ("One", ()),
+                    ("Two", ("Three",)),
+                    ("Three", ("Two",)),
                 ],
             ),
             (
                 [
-                    _ActionForTesting(id="One"),
-                    _ActionForTesting(id="Two", dependencies=("Three",)),
-                    _ActionForTesting(id="Three", dependencies=("Four",)),
-                    _ActionForTesting(id="Four", dependencies=("Two",)),
+                    ("One", ()),
+                    ("Two", ("Three",)),
+                    ("Three", ("Four",)),
+                    ("Four", ("Two",)),
                 ],
             ),
             (
                 [
-                    _ActionForTesting(id="One", dependencies=("Three",)),
-                    _ActionForTesting(id="Two", dependencies=("Three",)),
-                    _ActionForTesting(id="Three", dependencies=("Four",)),
-                    _ActionForTesting(id="Four", dependencies=("One",)),
+                    ("One", ("Three",)),
+                    ("Two", ("Three",)),
+                    ("Three", ("Four",)),
+                    ("Four", ("One",)),
                 ],
             ),
         ),
+        ids=(
+            "unknown_dependency",
+            "dependent_on_unknown",
+            "duplicate_id_with_unknown",
+            "cycle_of_two",
+            "cycle_of_three",
+            "cycle_through_first",
+        ),
     )
     def test_no_solutions(self, potential_actions):
         """All of these have unsatisfied dependencies."""
         with pytest.raises(actions.DependencyError):
-            list(actions.resolve_action_order(potential_actions))
+            deque(actions.resolve_action_order(_make_actions(potential_actions)), maxlen=0)
 
     @pytest.mark.parametrize(
         ("potential", "previous", "ordered_result"),
         (
             (
                 [
-                    _ActionForTesting(id="One"),
-                    _ActionForTesting(
-                        id="Two",
-                        dependencies=(
-                            "One",
-                            "Three",
-                        ),
-                    ),
-                    _ActionForTesting(id="Three", dependencies=("One",)),
-                    _ActionForTesting(id="Four", dependencies=("Two",)),
+                    ("One", ()),
+                    ("Two", ("One", "Three")),
+                    ("Three", ("One",)),
+                    ("Four", ("Two",)),
                 ],
                 [
-                    _ActionForTesting(id="Zero"),
+                    ("Zero", ()),
                 ],
                 ["One", "Three", "Two", "Four"],
             ),
             (
                 [
-                    _ActionForTesting(id="One"),
-                    _ActionForTesting(id="Two", dependencies=("Zero",)),
-                    _ActionForTesting(id="Three", dependencies=("One", "Two")),
-                    _ActionForTesting(id="Four", dependencies=("Three",)),
+                    ("One", ()),
+                    ("Two", ("Zero",)),
+                    ("Three", ("One", "Two")),
+                    ("Four", ("Three",)),
                 ],
                 [
-                    _ActionForTesting(id="Zero"),
+                    ("Zero", ()),
                 ],
                 ["One", "Two", "Three", "Four"],
                 # ["Two", "One", "Three", "Four"],
             ),
             (
                 [
-                    _ActionForTesting(id="One"),
-                    _ActionForTesting(id="Two", dependencies=("One",)),
+                    ("One", ()),
+                    ("Two", ("One",)),
                 ],
                 [
-                    _ActionForTesting(id="Zero"),
-                    _ActionForTesting(id="Three"),
-                    _ActionForTesting(id="Zed"),
+                    ("Zero", ()),
+                    ("Three", ()),
+                    ("Zed", ()),
                 ],
                 ["One", "Two"],
             ),
             (
                 [
-                    _ActionForTesting(id="One", dependencies=("Zero",)),
-                    _ActionForTesting(
-                        id="Two",
-                        dependencies=(
-                            "Zero",
-                            "One",
-                        ),
-                    ),
+                    ("One", ("Zero",)),
+                    ("Two", ("Zero", "One")),
                 ],
                 [
-                    _ActionForTesting(id="Zero"),
+                    ("Zero", ()),
                 ],
                 ["One", "Two"],
             ),
         ),
+        ids=("previous_unused", "dependency_on_previous", "previous_not_needed", "all_depend_on_previous"),
     )
     def test_with_previously_resolved_actions(self, potential, previous, ordered_result):
-        computed_actions = actions.resolve_action_order(potential, previously_resolved_actions=previous)
+        computed_actions = actions.resolve_action_order(
+            _make_actions(potential), previously_resolved_actions=_make_actions(previous)
+        )
 
-        computed_action_ids = [action.id for action in computed_actions]
+        computed_action_ids = list(map(attrgetter("id"), computed_actions))
         assert computed_action_ids == ordered_result
 
     @pytest.mark.parametrize(
         ("potential", "previous"),
         (
             (
-                [_ActionForTesting(id="One", dependencies=("Unknown",))],
+                [("One", ("Unknown",))],
                 [
-                    _ActionForTesting(id="Zero"),
+                    ("Zero", ()),
                 ],
             ),
             (
-                [_ActionForTesting(id="One"), _ActionForTesting(id="Four", dependencies=("Unknown",))],
+                [("One", ()), ("Four", ("Unknown",))],
                 [
-                    _ActionForTesting(id="Zero"),
+                    ("Zero", ()),
                 ],
             ),
         ),
+        ids=("unknown_dependency", "unknown_dependency_after_resolvable"),
     )
     def test_with_previously_resolved_actions_no_solutions(self, potential, previous):
         with pytest.raises(actions.DependencyError):
-            list(actions.resolve_action_order(potential, previous))
+            deque(actions.resolve_action_order(_make_actions(potential), _make_actions(previous)), maxlen=0)
+
+
+def _expected_message(level, id, title="", description="", diagnosis="", remediations="", variables=None):
+    """Build the dict that ActionMessage.to_dict() is expected to return."""
+    return {
+        "level": level,
+        "id": id,
+        "title": title,
+        "description": description,
+        "diagnosis": diagnosis,
+        "remediations": remediations,
+        "variables": variables if variables is not None else {},
+    }
+
+
+def _make_finished_actions(successes, failures, skips):
+    """
+    Create the FinishedActions for a test from lists of _ActionForTesting attributes.
+
+    The "result" and "messages" entries hold the keyword arguments for the
+    ActionResult and ActionMessages of the Action.  As with _make_actions(),
+    this lets the Actions be created only when the test which needs them is run.
+    """
+
+    def make_action(attributes):
+        attributes = dict(attributes)
+        attributes["result"] = ActionResult(**attributes["result"])
+        attributes["messages"] = [ActionMessage(**message) for message in attributes.get("messages", ())]
+        return _ActionForTesting(**attributes)
+
+    return actions.FinishedActions(
+        [make_action(a) for a in successes],
+        [make_action(a) for a in failures],
+        [make_action(a) for a in skips],
+    )
+
+
+@pytest.fixture
+def stage_mocks(monkeypatch):
+    """
+    Mock out the methods of Stage which check dependencies and run the Actions.
+
+    :returns: Tuple of the check_dependencies and run mocks.  Tests set the
+        FinishedActions that the Stages return on the run mock.
+    """
+    check_deps_mock = mock.Mock()
+    run_mock = mock.Mock()
+    monkeypatch.setattr(actions.Stage, "check_dependencies", check_deps_mock)
+    monkeypatch.setattr(actions.Stage, "run", run_mock)
+
+    return check_deps_mock, run_mock
 
 
 class TestRunActions:
@@ -745,50 +893,36 @@ class TestRunActions:
         (
             # Only successes
             (
-                actions.FinishedActions([], [], []),
+                ([], [], []),
                 {},
             ),
             (
-                actions.FinishedActions(
-                    [
-                        _ActionForTesting(id="One", messages=[], result=ActionResult(level="SUCCESS", id="SUCCESS")),
-                    ],
-                    [],
-                    [],
-                ),
+                ([{"id": "One", "messages": [], "result": {"level": "SUCCESS", "id": "SUCCESS"}}], [], []),
                 {
                     "One": {
                         "messages": [],
-                        "result": {
-                            "level": STATUS_CODE["SUCCESS"],
-                            "id": "SUCCESS",
-                            "title": "",
-                            "description": "",
-                            "diagnosis": "",
-                            "remediations": "",
-                            "variables": {},
-                        },
+                        "result": _expected_message(STATUS_SUCCESS, "SUCCESS"),
                     }
                 },
             ),
             (
-                actions.FinishedActions(
+                (
                     [
-                        _ActionForTesting(
-                            id="One",
-                            messages=[],
-                            result=ActionResult(level="SUCCESS", id="SUCCESS"),
-                            dependencies=("One",),
-                        ),
-                        _ActionForTesting(
-                            id="Two",
-                            messages=[],
-                            result=ActionResult(level="SUCCESS", id="SUCCESS"),
-                            dependencies=(
+                        {
+                            "id": "One",
+                            "messages": [],
+                            "result": {"level": "SUCCESS", "id": "SUCCESS"},
+                            "dependencies": ("One",),
+                        },
+                        {
+                            "id": "Two",
+                            "messages": [],
+                            "result": {"level": "SUCCESS", "id": "SUCCESS"},
+                            "dependencies": (
                                 "One",
                                 "Two",
                             ),
-                        ),
+                        },
                     ],
                     [],
                     [],
@@ -796,215 +930,181 @@ class TestRunActions:
                 {
                     "One": {
                         "messages": [],
-                        "result": {
-                            "level": STATUS_CODE["SUCCESS"],
-                            "id": "SUCCESS",
-                            "title": "",
-                            "description": "",
-                            "diagnosis": "",
-                            "remediations": "",
-                            "variables": {},
-                        },
+                        "result": _expected_message(STATUS_SUCCESS, "SUCCESS"),
                     },
                     "Two": {
                         "messages": [],
-                        "result": {
-                            "level": STATUS_CODE["SUCCESS"],
-                            "id": "SUCCESS",
-                            "title": "",
-                            "description": "",
-                            "diagnosis": "",
-                            "remediations": "",
-                            "variables": {},
-                        },
+                        "result": _expected_message(STATUS_SUCCESS, "SUCCESS"),
                     },
                 },
             ),
             # Single Failures
             (
-                actions.FinishedActions(
+                (
                     [],
                     [
-                        _ActionForTesting(
-                            id="One",
-                            messages=[],
-                            result=ActionResult(
-                                level="ERROR",
-                                id="SOME_ERROR",
-                                title="Error",
-                                description="Action error",
-                                diagnosis="User error",
-                                remediations="move on",
-                            ),
-                        ),
+                        {
+                            "id": "One",
+                            "messages": [],
+                            "result": {
+                                "level": "ERROR",
+                                "id": "SOME_ERROR",
+                                "title": "Error",
+                                "description": "Action error",
+                                "diagnosis": "User error",
+                                "remediations": "move on",
+                            },
+                        }
                     ],
                     [],
                 ),
                 {
                     "One": {
                         "messages": [],
-                        "result": {
-                            "level": STATUS_CODE["ERROR"],
-                            "id": "SOME_ERROR",
-                            "title": "Error",
-                            "description": "Action error",
-                            "diagnosis": "User error",
-                            "remediations": "move on",
-                            "variables": {},
-                        },
+                        "result": _expected_message(
+                            STATUS_ERROR,
+                            "SOME_ERROR",
+                            title="Error",
+                            description="Action error",
+                            diagnosis="User error",
+                            remediations="move on",
+                        ),
                     },
                 },
             ),
             (
-                actions.FinishedActions(
+                (
                     [],
                     [
-                        _ActionForTesting(
-                            id="One",
-                            messages=[],
-                            result=ActionResult(
-                                level="OVERRIDABLE",
-                                id="SOME_ERROR",
-                                title="Overridable",
-                                description="Action overridable",
-                                diagnosis="User overridable",
-                                remediations="move on",
-                            ),
-                        ),
+                        {
+                            "id": "One",
+                            "messages": [],
+                            "result": {
+                                "level": "OVERRIDABLE",
+                                "id": "SOME_ERROR",
+                                "title": "Overridable",
+                                "description": "Action overridable",
+                                "diagnosis": "User overridable",
+                                "remediations": "move on",
+                            },
+                        }
                     ],
                     [],
                 ),
                 {
                     "One": {
                         "messages": [],
-                        "result": {
-                            "level": STATUS_CODE["OVERRIDABLE"],
-                            "id": "SOME_ERROR",
-                            "title": "Overridable",
-                            "description": "Action overridable",
-                            "diagnosis": "User overridable",
-                            "remediations": "move on",
-                            "variables": {},
-                        },
+                        "result": _expected_message(
+                            STATUS_OVERRIDABLE,
+                            "SOME_ERROR",
+                            title="Overridable",
+                            description="Action overridable",
+                            diagnosis="User overridable",
+                            remediations="move on",
+                        ),
                     },
                 },
             ),
             (
-                actions.FinishedActions(
+                (
                     [],
                     [],
                     [
-                        _ActionForTesting(
-                            id="One",
-                            messages=[],
-                            result=ActionResult(
-                                level="SKIP",
-                                id="SOME_ERROR",
-                                title="Skip",
-                                description="Action skip",
-                                diagnosis="User skip",
-                                remediations="move on",
-                            ),
-                        ),
+                        {
+                            "id": "One",
+                            "messages": [],
+                            "result": {
+                                "level": "SKIP",
+                                "id": "SOME_ERROR",
+                                "title": "Skip",
+                                "description": "Action skip",
+                                "diagnosis": "User skip",
+                                "remediations": "move on",
+                            },
+                        }
                     ],
                 ),
                 {
                     "One": {
                         "messages": [],
-                        "result": {
-                            "level": STATUS_CODE["SKIP"],
-                            "id": "SOME_ERROR",
-                            "title": "Skip",
-                            "description": "Action skip",
-                            "diagnosis": "User skip",
-                            "remediations": "move on",
-                            "variables": {},
-                        },
+                        "result": _expected_message(
+                            STATUS_SKIP,
+                            "SOME_ERROR",
+                            title="Skip",
+                            description="Action skip",
+                            diagnosis="User skip",
+                            remediations="move on",
+                        ),
                     },
                 },
             ),
             # Mixture of failures and successes.
             (
-                actions.FinishedActions(
-                    [
-                        _ActionForTesting(id="Three", messages=[], result=ActionResult(level="SUCCESS", id="SUCCESS")),
-                    ],
+                (
+                    [{"id": "Three", "messages": [], "result": {"level": "SUCCESS", "id": "SUCCESS"}}],
                     [
-                        _ActionForTesting(
-                            id="One",
-                            messages=[],
-                            result=ActionResult(
-                                level="ERROR",
-                                id="ERROR_ID",
-                                title="Error",
-                                description="Action error",
-                                diagnosis="User error",
-                                remediations="move on",
-                            ),
-                        ),
+                        {
+                            "id": "One",
+                            "messages": [],
+                            "result": {
+                                "level": "ERROR",
+                                "id": "ERROR_ID",
+                                "title": "Error",
+                                "description": "Action error",
+                                "diagnosis": "User error",
+                                "remediations": "move on",
+                            },
+                        }
                     ],
                     [
-                        _ActionForTesting(
-                            id="Two",
-                            messages=[],
-                            result=ActionResult(
-                                level="SKIP",
-                                id="SKIP_ID",
-                                title="Skip",
-                                description="Action skip",
-                                diagnosis="User skip",
-                                remediations="move on",
-                            ),
-                        ),
+                        {
+                            "id": "Two",
+                            "messages": [],
+                            "result": {
+                                "level": "SKIP",
+                                "id": "SKIP_ID",
+                                "title": "Skip",
+                                "description": "Action skip",
+                                "diagnosis": "User skip",
+                                "remediations": "move on",
+                            },
+                        }
                     ],
                 ),
                 {
                     "One": {
                         "messages": [],
-                        "result": {
-                            "level": STATUS_CODE["ERROR"],
-                            "id": "ERROR_ID",
-                            "title": "Error",
-                            "description": "Action error",
-                            "diagnosis": "User error",
-                            "remediations": "move on",
-                            "variables": {},
-                        },
+                        "result": _expected_message(
+                            STATUS_ERROR,
+                            "ERROR_ID",
+                            title="Error",
+                            description="Action error",
+                            diagnosis="User error",
+                            remediations="move on",
+                        ),
                     },
                     "Two": {
                         "messages": [],
-                        "result": {
-                            "level": STATUS_CODE["SKIP"],
-                            "id": "SKIP_ID",
-                            "title": "Skip",
-                            "description": "Action skip",
-                            "diagnosis": "User skip",
-                            "remediations": "move on",
-                            "variables": {},
-                        },
+                        "result": _expected_message(
+                            STATUS_SKIP,
+                            "SKIP_ID",
+                            title="Skip",
+                            description="Action skip",
+                            diagnosis="User skip",
+                            remediations="move on",
+                        ),
                     },
                     "Three": {
                         "messages": [],
-                        "result": {
-                            "level": STATUS_CODE["SUCCESS"],
-                            "id": "SUCCESS",
-                            "title": "",
-                            "description": "",
-                            "diagnosis": "",
-                            "remediations": "",
-                            "variables": {},
-                        },
+                        "result": _expected_message(STATUS_SUCCESS, "SUCCESS"),
                     },
                 },
             ),
         ),
     )
-    def test_run_pre_actions(self, action_results, expected, monkeypatch):
-        check_deps_mock = mock.Mock()
-        run_mock = mock.Mock(return_value=action_results)
-
-        monkeypatch.setattr(actions.Stage, "check_dependencies", check_deps_mock)
-        monkeypatch.setattr(actions.Stage, "run", run_mock)
+    def test_run_pre_actions(self, action_results, expected, stage_mocks):
+        _, run_mock = stage_mocks
+        run_mock.return_value = _make_finished_actions(*action_results)
 
         assert actions.run_pre_actions() == expected
 
@@ -1013,22 +1113,22 @@ class TestRunActions:
         (
             # Only successes
             (
-                actions.FinishedActions(
+                (
                     [
-                        _ActionForTesting(
-                            id="One",
-                            messages=[
-                                ActionMessage(
-                                    level="WARNING",
-                                    id="WARNING_ID",
-                                    title="Warning",
-                                    description="Action warning",
-                                    diagnosis="User warning",
-                                    remediations="move on",
-                                )
+                        {
+                            "id": "One",
+                            "messages": [
+                                {
+                                    "level": "WARNING",
+                                    "id": "WARNING_ID",
+                                    "title": "Warning",
+                                    "description": "Action warning",
+                                    "diagnosis": "User warning",
+                                    "remediations": "move on",
+                                }
                             ],
-                            result=ActionResult(level="SUCCESS", id="SUCCESS"),
-                        ),
+                            "result": {"level": "SUCCESS", "id": "SUCCESS"},
+                        }
                     ],
                     [],
                     [],
@@ -1036,64 +1136,55 @@ class TestRunActions:
                 {
                     "One": {
                         "messages": [
-                            {
-                                "level": STATUS_CODE["WARNING"],
-                                "id": "WARNING_ID",
-                                "title": "Warning",
-                                "description": "Action warning",
-                                "diagnosis": "User warning",
-                                "remediations": "move on",
-                                "variables": {},
-                            }
+                            _expected_message(
+                                STATUS_WARNING,
+                                "WARNING_ID",
+                                title="Warning",
+                                description="Action warning",
+                                diagnosis="User warning",
+                                remediations="move on",
+                            )
                         ],
-                        "result": {
-                            "level": STATUS_CODE["SUCCESS"],
-                            "id": "SUCCESS",
-                            "title": "",
-                            "description": "",
-                            "diagnosis": "",
-                            "remediations": "",
-                            "variables": {},
-                        },
+                        "result": _expected_message(STATUS_SUCCESS, "SUCCESS"),
                     }
                 },
             ),
             (
-                actions.FinishedActions(
+                (
                     [
-                        _ActionForTesting(
-                            id="One",
-                            messages=[
-                                ActionMessage(
-                                    level="WARNING",
-                                    id="WARNING_ID",
-                                    title="Warning",
-                                    description="Action warning",
-                                    diagnosis="User warning",
-                                    remediations="move on",
-                                )
+                        {
+                            "id": "One",
+                            "messages": [
+                                {
+                                    "level": "WARNING",
+                                    "id": "WARNING_ID",
+                                    "title": "Warning",
+                                    "description": "Action warning",
+                                    "diagnosis": "User warning",
+                                    "remediations": "move on",
+                                }
                             ],
-                            result=ActionResult(level="SUCCESS", id="SUCCESS"),
-                            dependencies=("One",),
-                        ),
-                        _ActionForTesting(
-                            id="Two",
-                            messages=[
-                                ActionMessage(
-                                    level="WARNING",
-                                    id="WARNING_ID",
-                                    title="Warning",
-                                    description="Action warning",
-                                    diagnosis="User warning",
-                                    remediations="move on",
-                                )
+                            "result": {"level": "SUCCESS", "id": "SUCCESS"},
+                            "dependencies": ("One",),
+                        },
+                        {
+                            "id": "Two",
+                            "messages": [
+                                {
+                                    "level": "WARNING",
+                                    "id": "WARNING_ID",
+                                    "title": "Warning",
+                                    "description": "Action warning",
+                                    "diagnosis": "User warning",
+                                    "remediations": "move on",
+                                }
                             ],
-                            result=ActionResult(level="SUCCESS", id="SUCCESS"),
-                            dependencies=(
+                            "result": {"level": "SUCCESS", "id": "SUCCESS"},
+                            "dependencies": (
                                 "One",
                                 "Two",
                             ),
-                        ),
+                        },
                     ],
                     [],
                     [],
@@ -1101,353 +1192,313 @@ class TestRunActions:
                 {
                     "One": {
                         "messages": [
-                            {
-                                "level": STATUS_CODE["WARNING"],
-                                "id": "WARNING_ID",
-                                "title": "Warning",
-                                "description": "Action warning",
-                                "diagnosis": "User warning",
-                                "remediations": "move on",
-                                "variables": {},
-                            }
+                            _expected_message(
+                                STATUS_WARNING,
+                                "WARNING_ID",
+                                title="Warning",
+                                description="Action warning",
+                                diagnosis="User warning",
+                                remediations="move on",
+                            )
                         ],
-                        "result": {
-                            "level": STATUS_CODE["SUCCESS"],
-                            "id": "SUCCESS",
-                            "title": "",
-                            "description": "",
-                            "diagnosis": "",
-                            "remediations": "",
-                            "variables": {},
-                        },
+                        "result": _expected_message(STATUS_SUCCESS, "SUCCESS"),
                     },
                     "Two": {
                         "messages": [
-                            {
-                                "level": STATUS_CODE["WARNING"],
-                                "id": "WARNING_ID",
-                                "title": "Warning",
-                                "description": "Action warning",
-                                "diagnosis": "User warning",
-                                "remediations": "move on",
-                                "variables": {},
-                            }
+                            _expected_message(
+                                STATUS_WARNING,
+                                "WARNING_ID",
+                                title="Warning",
+                                description="Action warning",
+                                diagnosis="User warning",
+                                remediations="move on",
+                            )
                         ],
-                        "result": {
-                            "level": STATUS_CODE["SUCCESS"],
-                            "id": "SUCCESS",
-                            "title": "",
-                            "description": "",
-                            "diagnosis": "",
-                            "remediations": "",
-                            "variables": {},
-                        },
+                        "result": _expected_message(STATUS_SUCCESS, "SUCCESS"),
                     },
                 },
             ),
             # Single Failures
             (
-                actions.FinishedActions(
+                (
                     [],
                     [
-                        _ActionForTesting(
-                            id="One",
-                            messages=[
-                                ActionMessage(
-                                    level="WARNING",
-                                    id="WARNING_ID",
-                                    title="Warning",
-                                    description="Action warning",
-                                    diagnosis="User warning",
-                                    remediations="move on",
-                                )
+                        {
+                            "id": "One",
+                            "messages": [
+                                {
+                                    "level": "WARNING",
+                                    "id": "WARNING_ID",
+                                    "title": "Warning",
+                                    "description": "Action warning",
+                                    "diagnosis": "User warning",
+                                    "remediations": "move on",
+                                }
                             ],
-                            result=ActionResult(
-                                level="ERROR",
-                                id="SOME_ERROR",
-                                title="Error",
-                                description="Action error",
-                                diagnosis="User error",
-                                remediations="move on",
-                            ),
-                        ),
+                            "result": {
+                                "level": "ERROR",
+                                "id": "SOME_ERROR",
+                                "title": "Error",
+                                "description": "Action error",
+                                "diagnosis": "User error",
+                                "remediations": "move on",
+                            },
+                        }
                     ],
                     [],
                 ),
                 {
                     "One": {
                         "messages": [
-                            {
-                                "level": STATUS_CODE["WARNING"],
-                                "id": "WARNING_ID",
-                                "title": "Warning",
-                                "description": "Action warning",
-                                "diagnosis": "User warning",
-                                "remediations": "move on",
-                                "variables": {},
-                            }
+                            _expected_message(
+                                STATUS_WARNING,
+                                "WARNING_ID",
+                                title="Warning",
+                                description="Action warning",
+                                diagnosis="User warning",
+                                remediations="move on",
+                            )
                         ],
-                        "result": {
-                            "level": STATUS_CODE["ERROR"],
-                            "id": "SOME_ERROR",
-                            "title": "Error",
-                            "description": "Action error",
-                            "diagnosis": "User error",
-                            "remediations": "move on",
-                            "variables": {},
-                        },
+                        "result": _expected_message(
+                            STATUS_ERROR,
+                            "SOME_ERROR",
+                            title="Error",
+                            description="Action error",
+                            diagnosis="User error",
+                            remediations="move on",
+                        ),
                     },
                 },
             ),
             (
-                actions.FinishedActions(
+                (
                     [],
                     [
-                        _ActionForTesting(
-                            id="One",
-                            messages=[
-                                ActionMessage(
-                                    level="WARNING",
-                                    id="WARNING_ID",
-                                    title="Warning",
-                                    description="Action warning",
-                                    diagnosis="User warning",
-                                    remediations="move on",
-                                )
+                        {
+                            "id": "One",
+                            "messages": [
+                                {
+                                    "level": "WARNING",
+                                    "id": "WARNING_ID",
+                                    "title": "Warning",
+                                    "description": "Action warning",
+                                    "diagnosis": "User warning",
+                                    "remediations": "move on",
+                                }
                             ],
-                            result=ActionResult(
-                                level="OVERRIDABLE",
-                                id="SOME_ERROR",
-                                title="Overridable",
-                                description="Action overridable",
-                                diagnosis="User overridable",
-                                remediations="move on",
-                            ),
-                        ),
+                            "result": {
+                                "level": "OVERRIDABLE",
+                                "id": "SOME_ERROR",
+                                "title": "Overridable",
+                                "description": "Action overridable",
+                                "diagnosis": "User overridable",
+                                "remediations": "move on",
+                            },
+                        }
                     ],
                     [],
                 ),
                 {
                     "One": {
                         "messages": [
-                            {
-                                "level": STATUS_CODE["WARNING"],
-                                "id": "WARNING_ID",
-                                "title": "Warning",
-                                "description": "Action warning",
-                                "diagnosis": "User warning",
-                                "remediations": "move on",
-                                "variables": {},
-                            }
+                            _expected_message(
+                                STATUS_WARNING,
+                                "WARNING_ID",
+                                title="Warning",
+                                description="Action warning",
+                                diagnosis="User warning",
+                                remediations="move on",
+                            )
                         ],
-                        "result": {
-                            "level": STATUS_CODE["OVERRIDABLE"],
-                            "id": "SOME_ERROR",
-                            "title": "Overridable",
-                            "description": "Action overridable",
-                            "diagnosis": "User overridable",
-                            "remediations": "move on",
-                            "variables": {},
-                        },
+                        "result": _expected_message(
+                            STATUS_OVERRIDABLE,
+                            "SOME_ERROR",
+                            title="Overridable",
+                            description="Action overridable",
+                            diagnosis="User overridable",
+                            remediations="move on",
+                        ),
                     },
                 },
             ),
             (
-                actions.FinishedActions(
+                (
                     [],
                     [],
                     [
-                        _ActionForTesting(
-                            id="One",
-                            messages=[
-                                ActionMessage(
-                                    level="WARNING",
-                                    id="WARNING_ID",
-                                    title="Warning",
-                                    description="Action warning",
-                                    diagnosis="User warning",
-                                    remediations="move on",
-                                )
+                        {
+                            "id": "One",
+                            "messages": [
+                                {
+                                    "level": "WARNING",
+                                    "id": "WARNING_ID",
+                                    "title": "Warning",
+                                    "description": "Action warning",
+                                    "diagnosis": "User warning",
+                                    "remediations": "move on",
+                                }
                             ],
-                            result=ActionResult(
-                                level="SKIP",
-                                id="SOME_ERROR",
-                                title="Skip",
-                                description="Action skip",
-                                diagnosis="User skip",
-                                remediations="move on",
-                            ),
-                        ),
+                            "result": {
+                                "level": "SKIP",
+                                "id": "SOME_ERROR",
+                                "title": "Skip",
+                                "description": "Action skip",
+                                "diagnosis": "User skip",
+                                "remediations": "move on",
+                            },
+                        }
                     ],
                 ),
                 {
                     "One": {
                         "messages": [
-                            {
-                                "level": STATUS_CODE["WARNING"],
-                                "id": "WARNING_ID",
-                                "title": "Warning",
-                                "description": "Action warning",
-                                "diagnosis": "User warning",
-                                "remediations": "move on",
-                                "variables": {},
-                            }
+                            _expected_message(
+                                STATUS_WARNING,
+                                "WARNING_ID",
+                                title="Warning",
+                                description="Action warning",
+                                diagnosis="User warning",
+                                remediations="move on",
+                            )
                         ],
-                        "result": {
-                            "level": STATUS_CODE["SKIP"],
-                            "id": "SOME_ERROR",
-                            "title": "Skip",
-                            "description": "Action skip",
-                            "diagnosis": "User skip",
-                            "remediations": "move on",
-                            "variables": {},
-                        },
+                        "result": _expected_message(
+                            STATUS_SKIP,
+                            "SOME_ERROR",
+                            title="Skip",
+                            description="Action skip",
+                            diagnosis="User skip",
+                            remediations="move on",
+                        ),
                     },
                 },
             ),
             # Mixture of failures and successes.
             (
-                actions.FinishedActions(
+                (
                     [
-                        _ActionForTesting(
-                            id="Three",
-                            messages=[
-                                ActionMessage(
-                                    level="WARNING",
-                                    id="WARNING_ID",
-                                    title="Warning",
-                                    description="Action warning",
-                                    diagnosis="User warning",
-                                    remediations="move on",
-                                )
+                        {
+                            "id": "Three",
+                            "messages": [
+                                {
+                                    "level": "WARNING",
+                                    "id": "WARNING_ID",
+                                    "title": "Warning",
+                                    "description": "Action warning",
+                                    "diagnosis": "User warning",
+                                    "remediations": "move on",
+                                }
                             ],
-                            result=ActionResult(level="SUCCESS", id="SUCCESS"),
-                        ),
+                            "result": {"level": "SUCCESS", "id": "SUCCESS"},
+                        }
                     ],
                     [
-                        _ActionForTesting(
-                            id="One",
-                            messages=[
-                                ActionMessage(
-                                    level="WARNING",
-                                    id="WARNING_ID",
-                                    title="Warning",
-                                    description="Action warning",
-                                    diagnosis="User warning",
-                                    remediations="move on",
-                                )
+                        {
+                            "id": "One",
+                            "messages": [
+                                {
+                                    "level": "WARNING",
+                                    "id": "WARNING_ID",
+                                    "title": "Warning",
+                                    "description": "Action warning",
+                                    "diagnosis": "User warning",
+                                    "remediations": "move on",
+                                }
                             ],
-                            result=ActionResult(
-                                level="ERROR",
-                                id="ERROR_ID",
-                                title="Error",
-                                description="Action error",
-                                diagnosis="User error",
-                                remediations="move on",
-                            ),
-                        ),
+                            "result": {
+                                "level": "ERROR",
+                                "id": "ERROR_ID",
+                                "title": "Error",
+                                "description": "Action error",
+                                "diagnosis": "User error",
+                                "remediations": "move on",
+                            },
+                        }
                     ],
                     [
-                        _ActionForTesting(
-                            id="Two",
-                            messages=[
-                                ActionMessage(
-                                    level="WARNING",
-                                    id="WARNING_ID",
-                                    title="Warning",
-                                    description="Action warning",
-                                    diagnosis="User warning",
-                                    remediations="move on",
-                                )
+                        {
+                            "id": "Two",
+                            "messages": [
+                                {
+                                    "level": "WARNING",
+                                    "id": "WARNING_ID",
+                                    "title": "Warning",
+                                    "description": "Action warning",
+                                    "diagnosis": "User warning",
+                                    "remediations": "move on",
+                                }
                             ],
-                            result=ActionResult(
-                                level="SKIP",
-                                id="SKIP_ID",
-                                title="Skip",
-                                description="Action skip",
-                                diagnosis="User skip",
-                                remediations="move on",
-                            ),
-                        ),
+                            "result": {
+                                "level": "SKIP",
+                                "id": "SKIP_ID",
+                                "title": "Skip",
+                                "description": "Action skip",
+                                "diagnosis": "User skip",
+                                "remediations": "move on",
+                            },
+                        }
                     ],
                 ),
                 {
                     "One": {
                         "messages": [
-                            {
-                                "level": STATUS_CODE["WARNING"],
-                                "id": "WARNING_ID",
-                                "title": "Warning",
-                                "description": "Action warning",
-                                "diagnosis": "User warning",
-                                "remediations": "move on",
-                                "variables": {},
-                            }
+                            _expected_message(
+                                STATUS_WARNING,
+                                "WARNING_ID",
+                                title="Warning",
+                                description="Action warning",
+                                diagnosis="User warning",
+                                remediations="move on",
+                            )
                         ],
-                        "result": {
-                            "level": STATUS_CODE["ERROR"],
-                            "id": "ERROR_ID",
-                            "title": "Error",
-                            "description": "Action error",
-                            "diagnosis": "User error",
-                            "remediations": "move on",
-                            "variables": {},
-                        },
+                        "result": _expected_message(
+                            STATUS_ERROR,
+                            "ERROR_ID",
+                            title="Error",
+                            description="Action error",
+                            diagnosis="User error",
+                            remediations="move on",
+                        ),
                     },
                     "Two": {
                         "messages": [
-                            {
-                                "level": STATUS_CODE["WARNING"],
-                                "id": "WARNING_ID",
-                                "title": "Warning",
-                                "description": "Action warning",
-                                "diagnosis": "User warning",
-                                "remediations": "move on",
-                                "variables": {},
-                            }
+                            _expected_message(
+                                STATUS_WARNING,
+                                "WARNING_ID",
+                                title="Warning",
+                                description="Action warning",
+                                diagnosis="User warning",
+                                remediations="move on",
+                            )
                         ],
-                        "result": {
-                            "level": STATUS_CODE["SKIP"],
-                            "id": "SKIP_ID",
-                            "title": "Skip",
-                            "description": "Action skip",
-                            "diagnosis": "User skip",
-                            "remediations": "move on",
-                            "variables": {},
-                        },
+                        "result": _expected_message(
+                            STATUS_SKIP,
+                            "SKIP_ID",
+                            title="Skip",
+                            description="Action skip",
+                            diagnosis="User skip",
+                            remediations="move on",
+                        ),
                     },
                     "Three": {
                         "messages": [
-                            {
-                                "level": STATUS_CODE["WARNING"],
-                                "id": "WARNING_ID",
-                                "title": "Warning",
-                                "description": "Action warning",
-                                "diagnosis": "User warning",
-                                "remediations": "move on",
-                                "variables": {},
-                            }
+                            _expected_message(
+                                STATUS_WARNING,
+                                "WARNING_ID",
+                                title="Warning",
+                                description="Action warning",
+                                diagnosis="User warning",
+                                remediations="move on",
+                            )
                         ],
-                        "result": {
-                            "level": STATUS_CODE["SUCCESS"],
-                            "id": "SUCCESS",
-                            "title": "",
-                            "description": "",
-                            "diagnosis": "",
-                            "remediations": "",
-                            "variables": {},
-                        },
+                        "result": _expected_message(STATUS_SUCCESS, "SUCCESS"),
                     },
                 },
             ),
         ),
     )
-    def test_run_pre_actions_with_messages(self, action_results, expected, monkeypatch):
-        check_deps_mock = mock.Mock()
-        run_mock = mock.Mock(return_value=action_results)
-
-        monkeypatch.setattr(actions.Stage, "check_dependencies", check_deps_mock)
-        monkeypatch.setattr(actions.Stage, "run", run_mock)
+    def test_run_pre_actions_with_messages(self, action_results, expected, stage_mocks):
+        _, run_mock = stage_mocks
+        run_mock.return_value = _make_finished_actions(*action_results)
 
         results = actions.run_pre_actions()
         assert results == expected
@@ -1469,50 +1520,36 @@ class TestRunActions:
         (
             # Only successes
             (
-                actions.FinishedActions([], [], []),
+                ([], [], []),
                 {},
             ),
             (
-                actions.FinishedActions(
-                    [
-                        _ActionForTesting(id="One", messages=[], result=ActionResult(level="SUCCESS", id="SUCCESS")),
-                    ],
-                    [],
-                    [],
-                ),
+                ([{"id": "One", "messages": [], "result": {"level": "SUCCESS", "id": "SUCCESS"}}], [], []),
                 {
                     "One": {
                         "messages": [],
-                        "result": {
-                            "level": STATUS_CODE["SUCCESS"],
-                            "id": "SUCCESS",
-                            "title": "",
-                            "description": "",
-                            "diagnosis": "",
-                            "remediations": "",
-                            "variables": {},
-                        },
+                        "result": _expected_message(STATUS_SUCCESS, "SUCCESS"),
                     }
                 },
             ),
             (
-                actions.FinishedActions(
+                (
                     [
-                        _ActionForTesting(
-                            id="One",
-                            messages=[],
-                            result=ActionResult(level="SUCCESS", id="SUCCESS"),
-                            dependencies=("One",),
-                        ),
-                        _ActionForTesting(
-                            id="Two",
-                            messages=[],
-                            result=ActionResult(level="SUCCESS", id="SUCCESS"),
-                            dependencies=(
+                        {
+                            "id": "One",
+                            "messages": [],
+                            "result": {"level": "SUCCESS", "id": "SUCCESS"},
+                            "dependencies": ("One",),
+                        },
+                        {
+                            "id": "Two",
+                            "messages": [],
+                            "result": {"level": "SUCCESS", "id": "SUCCESS"},
+                            "dependencies": (
                                 "One",
                                 "Two",
                             ),
-                        ),
+                        },
                     ],
                     [],
                     [],
@@ -1520,215 +1557,181 @@ class TestRunActions:
                 {
                     "One": {
                         "messages": [],
-                        "result": {
-                            "level": STATUS_CODE["SUCCESS"],
-                            "id": "SUCCESS",
-                            "title": "",
-                            "description": "",
-                            "diagnosis": "",
-                            "remediations": "",
-                            "variables": {},
-                        },
+                        "result": _expected_message(STATUS_SUCCESS, "SUCCESS"),
                     },
                     "Two": {
                         "messages": [],
-                        "result": {
-                            "level": STATUS_CODE["SUCCESS"],
-                            "id": "SUCCESS",
-                            "title": "",
-                            "description": "",
-                            "diagnosis": "",
-                            "remediations": "",
-                            "variables": {},
-                        },
+                        "result": _expected_message(STATUS_SUCCESS, "SUCCESS"),
                     },
                 },
             ),
             # Single Failures
             (
-                actions.FinishedActions(
+                (
                     [],
                     [
-                        _ActionForTesting(
-                            id="One",
-                            messages=[],
-                            result=ActionResult(
-                                level="ERROR",
-                                id="SOME_ERROR",
-                                title="Error",
-                                description="Action error",
-                                diagnosis="User error",
-                                remediations="move on",
-                            ),
-                        ),
+                        {
+                            "id": "One",
+                            "messages": [],
+                            "result": {
+                                "level": "ERROR",
+                                "id": "SOME_ERROR",
+                                "title": "Error",
+                                "description": "Action error",
+                                "diagnosis": "User error",
+                                "remediations": "move on",
+                            },
+                        }
                     ],
                     [],
                 ),
                 {
                     "One": {
                         "messages": [],
-                        "result": {
-                            "level": STATUS_CODE["ERROR"],
-                            "id": "SOME_ERROR",
-                            "title": "Error",
-                            "description": "Action error",
-                            "diagnosis": "User error",
-                            "remediations": "move on",
-                            "variables": {},
-                        },
+                        "result": _expected_message(
+                            STATUS_ERROR,
+                            "SOME_ERROR",
+                            title="Error",
+                            description="Action error",
+                            diagnosis="User error",
+                            remediations="move on",
+                        ),
                     },
                 },
             ),
             (
-                actions.FinishedActions(
+                (
                     [],
                     [
-                        _ActionForTesting(
-                            id="One",
-                            messages=[],
-                            result=ActionResult(
-                                level="OVERRIDABLE",
-                                id="SOME_ERROR",
-                                title="Overridable",
-                                description="Action overridable",
-                                diagnosis="User overridable",
-                                remediations="move on",
-                            ),
-                        ),
+                        {
+                            "id": "One",
+                            "messages": [],
+                            "result": {
+                                "level": "OVERRIDABLE",
+                                "id": "SOME_ERROR",
+                                "title": "Overridable",
+                                "description": "Action overridable",
+                                "diagnosis": "User overridable",
+                                "remediations": "move on",
+                            },
+                        }
                     ],
                     [],
                 ),
                 {
                     "One": {
                         "messages": [],
-                        "result": {
-                            "level": STATUS_CODE["OVERRIDABLE"],
-                            "id": "SOME_ERROR",
-                            "title": "Overridable",
-                            "description": "Action overridable",
-                            "diagnosis": "User overridable",
-                            "remediations": "move on",
-                            "variables": {},
-                        },
+                        "result": _expected_message(
+                            STATUS_OVERRIDABLE,
+                            "SOME_ERROR",
+                            title="Overridable",
+                            description="Action overridable",
+                            diagnosis="User overridable",
+                            remediations="move on",
+                        ),
                     },
                 },
             ),
             (
-                actions.FinishedActions(
+                (
                     [],
                     [],
                     [
-                        _ActionForTesting(
-                            id="One",
-                            messages=[],
-                            result=ActionResult(
-                                level="SKIP",
-                                id="SOME_ERROR",
-                                title="Skip",
-                                description="Action skip",
-                                diagnosis="User skip",
-                                remediations="move on",
-                            ),
-                        ),
+                        {
+                            "id": "One",
+                            "messages": [],
+                            "result": {
+                                "level": "SKIP",
+                                "id": "SOME_ERROR",
+                                "title": "Skip",
+                                "description": "Action skip",
+                                "diagnosis": "User skip",
+                                "remediations": "move on",
+                            },
+                        }
                     ],
                 ),
                 {
                     "One": {
                         "messages": [],
-                        "result": {
-                            "level": STATUS_CODE["SKIP"],
-                            "id": "SOME_ERROR",
-                            "title": "Skip",
-                            "description": "Action skip",
-                            "diagnosis": "User skip",
-                            "remediations": "move on",
-                            "variables": {},
-                        },
+                        "result": _expected_message(
+                            STATUS_SKIP,
+                            "SOME_ERROR",
+                            title="Skip",
+                            description="Action skip",
+                            diagnosis="User skip",
+                            remediations="move on",
+                        ),
                     },
                 },
             ),
             # Mixture of failures and successes.
             (
-                actions.FinishedActions(
-                    [
-                        _ActionForTesting(id="Three", messages=[], result=ActionResult(level="SUCCESS", id="SUCCESS")),
-                    ],
+                (
+                    [{"id": "Three", "messages": [], "result": {"level": "SUCCESS", "id": "SUCCESS"}}],
                     [
-                        _ActionForTesting(
-                            id="One",
-                            messages=[],
-                            result=ActionResult(
-                                level="ERROR",
-                                id="ERROR_ID",
-                                title="Error",
-                                description="Action error",
-                                diagnosis="User error",
-                                remediations="move on",
-                            ),
-                        ),
+                        {
+                            "id": "One",
+                            "messages": [],
+                            "result": {
+                                "level": "ERROR",
+                                "id": "ERROR_ID",
+                                "title": "Error",
+                                "description": "Action error",
+                                "diagnosis": "User error",
+                                "remediations": "move on",
+                            },
+                        }
                     ],
                     [
-                        _ActionForTesting(
-                            id="Two",
-                            messages=[],
-                            result=ActionResult(
-                                level="SKIP",
-                                id="SKIP_ID",
-                                title="Skip",
-                                description="Action skip",
-                                diagnosis="User skip",
-                                remediations="move on",
-                            ),
-                        ),
+                        {
+                            "id": "Two",
+                            "messages": [],
+                            "result": {
+                                "level": "SKIP",
+                                "id": "SKIP_ID",
+                                "title": "Skip",
+                                "description": "Action skip",
+                                "diagnosis": "User skip",
+                                "remediations": "move on",
+                            },
+                        }
                     ],
                 ),
                 {
                     "One": {
                         "messages": [],
-                        "result": {
-                            "level": STATUS_CODE["ERROR"],
-                            "id": "ERROR_ID",
-                            "title": "Error",
-                            "description": "Action error",
-                            "diagnosis": "User error",
-                            "remediations": "move on",
-                            "variables": {},
-                        },
+                        "result": _expected_message(
+                            STATUS_ERROR,
+                            "ERROR_ID",
+                            title="Error",
+                            description="Action error",
+                            diagnosis="User error",
+                            remediations="move on",
+                        ),
                     },
                     "Two": {
                         "messages": [],
-                        "result": {
-                            "level": STATUS_CODE["SKIP"],
-                            "id": "SKIP_ID",
-                            "title": "Skip",
-                            "description": "Action skip",
-                            "diagnosis": "User skip",
-                            "remediations": "move on",
-                            "variables": {},
-                        },
+                        "result": _expected_message(
+                            STATUS_SKIP,
+                            "SKIP_ID",
+                            title="Skip",
+                            description="Action skip",
+                            diagnosis="User skip",
+                            remediations="move on",
+                        ),
                     },
                     "Three": {
                         "messages": [],
-                        "result": {
-                            "level": STATUS_CODE["SUCCESS"],
-                            "id": "SUCCESS",
-                            "title": "",
-                            "description": "",
-                            "diagnosis": "",
-                            "remediations": "",
-                            "variables": {},
-                        },
+                        "result": _expected_message(STATUS_SUCCESS, "SUCCESS"),
                     },
                 },
             ),
         ),
     )
-    def test_run_post_actions(self, action_results, expected, monkeypatch):
-        check_deps_mock = mock.Mock()
-        run_mock = mock.Mock(return_value=action_results)
-
-        monkeypatch.setattr(actions.Stage, "check_dependencies", check_deps_mock)
-        monkeypatch.setattr(actions.Stage, "run", run_mock)
+    def test_run_post_actions(self, action_results, expected, stage_mocks):
+        _, run_mock = stage_mocks
+        run_mock.return_value = _make_finished_actions(*action_results)
 
         assert actions.run_post_actions() == expected
 
@@ -1737,22 +1740,22 @@ class TestRunActions:
         (
             # Only successes
             (
-                actions.FinishedActions(
+                (
                     [
-                        _ActionForTesting(
-                            id="One",
-                            messages=[
-                                ActionMessage(
-                                    level="WARNING",
-                                    id="WARNING_ID",
-                                    title="Warning",
-                                    description="Action warning",
-                                    diagnosis="User warning",
-                                    remediations="move on",
-                                )
+                        {
+                            "id": "One",
+                            "messages": [
+                                {
+                                    "level": "WARNING",
+                                    "id": "WARNING_ID",
+                                    "title": "Warning",
+                                    "description": "Action warning",
+                                    "diagnosis": "User warning",
+                                    "remediations": "move on",
+                                }
                             ],
-                            result=ActionResult(level="SUCCESS", id="SUCCESS"),
-                        ),
+                            "result": {"level": "SUCCESS", "id": "SUCCESS"},
+                        }
                     ],
                     [],
                     [],
@@ -1760,64 +1763,55 @@ class TestRunActions:
                 {
                     "One": {
                         "messages": [
-                            {
-                                "level": STATUS_CODE["WARNING"],
-                                "id": "WARNING_ID",
-                                "title": "Warning",
-                                "description": "Action warning",
-                                "diagnosis": "User warning",
-                                "remediations": "move on",
-                                "variables": {},
-                            }
+                            _expected_message(
+                                STATUS_WARNING,
+                                "WARNING_ID",
+                                title="Warning",
+                                description="Action warning",
+                                diagnosis="User warning",
+                                remediations="move on",
+                            )
                         ],
-                        "result": {
-                            "level": STATUS_CODE["SUCCESS"],
-                            "id": "SUCCESS",
-                            "title": "",
-                            "description": "",
-                            "diagnosis": "",
-                            "remediations": "",
-                            "variables": {},
-                        },
+                        "result": _expected_message(STATUS_SUCCESS, "SUCCESS"),
                     }
                 },
             ),
             (
-                actions.FinishedActions(
+                (
                     [
-                        _ActionForTesting(
-                            id="One",
-                            messages=[
-                                ActionMessage(
-                                    level="WARNING",
-                                    id="WARNING_ID",
-                                    title="Warning",
-                                    description="Action warning",
-                                    diagnosis="User warning",
-                                    remediations="move on",
-                                )
+                        {
+                            "id": "One",
+                            "messages": [
+                                {
+                                    "level": "WARNING",
+                                    "id": "WARNING_ID",
+                                    "title": "Warning",
+                                    "description": "Action warning",
+                                    "diagnosis": "User warning",
+                                    "remediations": "move on",
+                                }
                             ],
-                            result=ActionResult(level="SUCCESS", id="SUCCESS"),
-                            dependencies=("One",),
-                        ),
-                        _ActionForTesting(
-                            id="Two",
-                            messages=[
-                                ActionMessage(
-                                    level="WARNING",
-                                    id="WARNING_ID",
-                                    title="Warning",
-                                    description="Action warning",
-                                    diagnosis="User warning",
-                                    remediations="move on",
-                                )
+                            "result": {"level": "SUCCESS", "id": "SUCCESS"},
+                            "dependencies": ("One",),
+                        },
+                        {
+                            "id": "Two",
+                            "messages": [
+                                {
+                                    "level": "WARNING",
+                                    "id": "WARNING_ID",
+                                    "title": "Warning",
+                                    "description": "Action warning",
+                                    "diagnosis": "User warning",
+                                    "remediations": "move on",
+                                }
                             ],
-                            result=ActionResult(level="SUCCESS", id="SUCCESS"),
-                            dependencies=(
+                            "result": {"level": "SUCCESS", "id": "SUCCESS"},
+                            "dependencies": (
                                 "One",
                                 "Two",
                             ),
-                        ),
+                        },
                     ],
                     [],
                     [],
@@ -1825,353 +1819,313 @@ class TestRunActions:
                 {
                     "One": {
                         "messages": [
-                            {
-                                "level": STATUS_CODE["WARNING"],
-                                "id": "WARNING_ID",
-                                "title": "Warning",
-                                "description": "Action warning",
-                                "diagnosis": "User warning",
-                                "remediations": "move on",
-                                "variables": {},
-                            }
+                            _expected_message(
+                                STATUS_WARNING,
+                                "WARNING_ID",
+                                title="Warning",
+                                description="Action warning",
+                                diagnosis="User warning",
+                                remediations="move on",
+                            )
                         ],
-                        "result": {
-                            "level": STATUS_CODE["SUCCESS"],
-                            "id": "SUCCESS",
-                            "title": "",
-                            "description": "",
-                            "diagnosis": "",
-                            "remediations": "",
-                            "variables": {},
-                        },
+                        "result": _expected_message(STATUS_SUCCESS, "SUCCESS"),
                     },
                     "Two": {
                         "messages": [
-                            {
-                                "level": STATUS_CODE["WARNING"],
-                                "id": "WARNING_ID",
-                                "title": "Warning",
-                                "description": "Action warning",
-                                "diagnosis": "User warning",
-                                "remediations": "move on",
-                                "variables": {},
-                            }
+                            _expected_message(
+                                STATUS_WARNING,
+                                "WARNING_ID",
+                                title="Warning",
+                                description="Action warning",
+                                diagnosis="User warning",
+                                remediations="move on",
+                            )
                         ],
-                        "result": {
-                            "level": STATUS_CODE["SUCCESS"],
-                            "id": "SUCCESS",
-                            "title": "",
-                            "description": "",
-                            "diagnosis": "",
-                            "remediations": "",
-                            "variables": {},
-                        },
+                        "result": _expected_message(STATUS_SUCCESS, "SUCCESS"),
                     },
                 },
             ),
             # Single Failures
             (
-                actions.FinishedActions(
+                (
                     [],
                     [
-                        _ActionForTesting(
-                            id="One",
-                            messages=[
-                                ActionMessage(
-                                    level="WARNING",
-                                    id="WARNING_ID",
-                                    title="Warning",
-                                    description="Action warning",
-                                    diagnosis="User warning",
-                                    remediations="move on",
-                                )
+                        {
+                            "id": "One",
+                            "messages": [
+                                {
+                                    "level": "WARNING",
+                                    "id": "WARNING_ID",
+                                    "title": "Warning",
+                                    "description": "Action warning",
+                                    "diagnosis": "User warning",
+                                    "remediations": "move on",
+                                }
                             ],
-                            result=ActionResult(
-                                level="ERROR",
-                                id="SOME_ERROR",
-                                title="Error",
-                                description="Action error",
-                                diagnosis="User error",
-                                remediations="move on",
-                            ),
-                        ),
+                            "result": {
+                                "level": "ERROR",
+                                "id": "SOME_ERROR",
+                                "title": "Error",
+                                "description": "Action error",
+                                "diagnosis": "User error",
+                                "remediations": "move on",
+                            },
+                        }
                     ],
                     [],
                 ),
                 {
                     "One": {
                         "messages": [
-                            {
-                                "level": STATUS_CODE["WARNING"],
-                                "id": "WARNING_ID",
-                                "title": "Warning",
-                                "description": "Action warning",
-                                "diagnosis": "User warning",
-                                "remediations": "move on",
-                                "variables": {},
-                            }
+                            _expected_message(
+                                STATUS_WARNING,
+                                "WARNING_ID",
+                                title="Warning",
+                                description="Action warning",
+                                diagnosis="User warning",
+                                remediations="move on",
+                            )
                         ],
-                        "result": {
-                            "level": STATUS_CODE["ERROR"],
-                            "id": "SOME_ERROR",
-                            "title": "Error",
-                            "description": "Action error",
-                            "diagnosis": "User error",
-                            "remediations": "move on",
-                            "variables": {},
-                        },
+                        "result": _expected_message(
+                            STATUS_ERROR,
+                            "SOME_ERROR",
+                            title="Error",
+                            description="Action error",
+                            diagnosis="User error",
+                            remediations="move on",
+                        ),
                     },
                 },
             ),
             (
-                actions.FinishedActions(
+                (
                     [],
                     [
-                        _ActionForTesting(
-                            id="One",
-                            messages=[
-                                ActionMessage(
-                                    level="WARNING",
-                                    id="WARNING_ID",
-                                    title="Warning",
-                                    description="Action warning",
-                                    diagnosis="User warning",
-                                    remediations="move on",
-                                )
+                        {
+                            "id": "One",
+                            "messages": [
+                                {
+                                    "level": "WARNING",
+                                    "id": "WARNING_ID",
+                                    "title": "Warning",
+                                    "description": "Action warning",
+                                    "diagnosis": "User warning",
+                                    "remediations": "move on",
+                                }
                             ],
-                            result=ActionResult(
-                                level="OVERRIDABLE",
-                                id="SOME_ERROR",
-                                title="Overridable",
-                                description="Action overridable",
-                                diagnosis="User overridable",
-                                remediations="move on",
-                            ),
-                        ),
+                            "result": {
+                                "level": "OVERRIDABLE",
+                                "id": "SOME_ERROR",
+                                "title": "Overridable",
+                                "description": "Action overridable",
+                                "diagnosis": "User overridable",
+                                "remediations": "move on",
+                            },
+                        }
                     ],
                     [],
                 ),
                 {
                     "One": {
                         "messages": [
-                            {
-                                "level": STATUS_CODE["WARNING"],
-                                "id": "WARNING_ID",
-                                "title": "Warning",
-                                "description": "Action warning",
-                                "diagnosis": "User warning",
-                                "remediations": "move on",
-                                "variables": {},
-                            }
+                            _expected_message(
+                                STATUS_WARNING,
+                                "WARNING_ID",
+                                title="Warning",
+                                description="Action warning",
+                                diagnosis="User warning",
+                                remediations="move on",
+                            )
                         ],
-                        "result": {
-                            "level": STATUS_CODE["OVERRIDABLE"],
-                            "id": "SOME_ERROR",
-                            "title": "Overridable",
-                            "description": "Action overridable",
-                            "diagnosis": "User overridable",
-                            "remediations": "move on",
-                            "variables": {},
-                        },
+                        "result": _expected_message(
+                            STATUS_OVERRIDABLE,
+                            "SOME_ERROR",
+                            title="Overridable",
+                            description="Action overridable",
+                            diagnosis="User overridable",
+                            remediations="move on",
+                        ),
                     },
                 },
             ),
             (
-                actions.FinishedActions(
+                (
                     [],
                     [],
                     [
-                        _ActionForTesting(
-                            id="One",
-                            messages=[
-                                ActionMessage(
-                                    level="WARNING",
-                                    id="WARNING_ID",
-                                    title="Warning",
-                                    description="Action warning",
-                                    diagnosis="User warning",
-                                    remediations="move on",
-                                )
+                        {
+                            "id": "One",
+                            "messages": [
+                                {
+                                    "level": "WARNING",
+                                    "id": "WARNING_ID",
+                                    "title": "Warning",
+                                    "description": "Action warning",
+                                    "diagnosis": "User warning",
+                                    "remediations": "move on",
+                                }
                             ],
-                            result=ActionResult(
-                                level="SKIP",
-                                id="SOME_ERROR",
-                                title="Skip",
-                                description="Action skip",
-                                diagnosis="User skip",
-                                remediations="move on",
-                            ),
-                        ),
+                            "result": {
+                                "level": "SKIP",
+                                "id": "SOME_ERROR",
+                                "title": "Skip",
+                                "description": "Action skip",
+                                "diagnosis": "User skip",
+                                "remediations": "move on",
+                            },
+                        }
                     ],
                 ),
                 {
                     "One": {
                         "messages": [
-                            {
-                                "level": STATUS_CODE["WARNING"],
-                                "id": "WARNING_ID",
-                                "title": "Warning",
-                                "description": "Action warning",
-                                "diagnosis": "User warning",
-                                "remediations": "move on",
-                                "variables": {},
-                            }
+                            _expected_message(
+                                STATUS_WARNING,
+                                "WARNING_ID",
+                                title="Warning",
+                                description="Action warning",
+                                diagnosis="User warning",
+                                remediations="move on",
+                            )
                         ],
-                        "result": {
-                            "level": STATUS_CODE["SKIP"],
-                            "id": "SOME_ERROR",
-                            "title": "Skip",
-                            "description": "Action skip",
-                            "diagnosis": "User skip",
-                            "remediations": "move on",
-                            "variables": {},
-                        },
+                        "result": _expected_message(
+                            STATUS_SKIP,
+                            "SOME_ERROR",
+                            title="Skip",
+                            description="Action skip",
+                            diagnosis="User skip",
+                            remediations="move on",
+                        ),
                     },
                 },
             ),
             # Mixture of failures and successes.
             (
-                actions.FinishedActions(
+                (
                     [
-                        _ActionForTesting(
-                            id="Three",
-                            messages=[
-                                ActionMessage(
-                                    level="WARNING",
-                                    id="WARNING_ID",
-                                    title="Warning",
-                                    description="Action warning",
-                                    diagnosis="User warning",
-                                    remediations="move on",
-                                )
+                        {
+                            "id": "Three",
+                            "messages": [
+                                {
+                                    "level": "WARNING",
+                                    "id": "WARNING_ID",
+                                    "title": "Warning",
+                                    "description": "Action warning",
+                                    "diagnosis": "User warning",
+                                    "remediations": "move on",
+                                }
                             ],
-                            result=ActionResult(level="SUCCESS", id="SUCCESS"),
-                        ),
+                            "result": {"level": "SUCCESS", "id": "SUCCESS"},
+                        }
                     ],
                     [
-                        _ActionForTesting(
-                            id="One",
-                            messages=[
-                                ActionMessage(
-                                    level="WARNING",
-                                    id="WARNING_ID",
-                                    title="Warning",
-                                    description="Action warning",
-                                    diagnosis="User warning",
-                                    remediations="move on",
-                                )
+                        {
+                            "id": "One",
+                            "messages": [
+                                {
+                                    "level": "WARNING",
+                                    "id": "WARNING_ID",
+                                    "title": "Warning",
+                                    "description": "Action warning",
+                                    "diagnosis": "User warning",
+                                    "remediations": "move on",
+                                }
                             ],
-                            result=ActionResult(
-                                level="ERROR",
-                                id="ERROR_ID",
-                                title="Error",
-                                description="Action error",
-                                diagnosis="User error",
-                                remediations="move on",
-                            ),
-                        ),
+                            "result": {
+                                "level": "ERROR",
+                                "id": "ERROR_ID",
+                                "title": "Error",
+                                "description": "Action error",
+                                "diagnosis": "User error",
+                                "remediations": "move on",
+                            },
+                        }
                     ],
                     [
-                        _ActionForTesting(
-                            id="Two",
-                            messages=[
-                                ActionMessage(
-                                    level="WARNING",
-                                    id="WARNING_ID",
-                                    title="Warning",
-                                    description="Action warning",
-                                    diagnosis="User warning",
-                                    remediations="move on",
-                                )
+                        {
+                            "id": "Two",
+                            "messages": [
+                                {
+                                    "level": "WARNING",
+                                    "id": "WARNING_ID",
+                                    "title": "Warning",
+                                    "description": "Action warning",
+                                    "diagnosis": "User warning",
+                                    "remediations": "move on",
+                                }
                             ],
-                            result=ActionResult(
-                                level="SKIP",
-                                id="SKIP_ID",
-                                title="Skip",
-                                description="Action skip",
-                                diagnosis="User skip",
-                                remediations="move on",
-                            ),
-                        ),
+                            "result": {
+                                "level": "SKIP",
+                                "id": "SKIP_ID",
+                                "title": "Skip",
+                                "description": "Action skip",
+                                "diagnosis": "User skip",
+                                "remediations": "move on",
+                            },
+                        }
                     ],
                 ),
                 {
                     "One": {
                         "messages": [
-                            {
-                                "level": STATUS_CODE["WARNING"],
-                                "id": "WARNING_ID",
-                                "title": "Warning",
-                                "description": "Action warning",
-                                "diagnosis": "User warning",
-                                "remediations": "move on",
-                                "variables": {},
-                            }
+                            _expected_message(
+                                STATUS_WARNING,
+                                "WARNING_ID",
+                                title="Warning",
+                                description="Action warning",
+                                diagnosis="User warning",
+                                remediations="move on",
+                            )
                         ],
-                        "result": {
-                            "level": STATUS_CODE["ERROR"],
-                            "id": "ERROR_ID",
-                            "title": "Error",
-                            "description": "Action error",
-                            "diagnosis": "User error",
-                            "remediations": "move on",
-                            "variables": {},
-                        },
+                        "result": _expected_message(
+                            STATUS_ERROR,
+                            "ERROR_ID",
+                            title="Error",
+                            description="Action error",
+                            diagnosis="User error",
+                            remediations="move on",
+                        ),
                     },
                     "Two": {
                         "messages": [
-                            {
-                                "level": STATUS_CODE["WARNING"],
-                                "id": "WARNING_ID",
-                                "title": "Warning",
-                                "description": "Action warning",
-                                "diagnosis": "User warning",
-                                "remediations": "move on",
-                                "variables": {},
-                            }
+                            _expected_message(
+                                STATUS_WARNING,
+                                "WARNING_ID",
+                                title="Warning",
+                                description="Action warning",
+                                diagnosis="User warning",
+                                remediations="move on",
+                            )
                         ],
-                        "result": {
-                            "level": STATUS_CODE["SKIP"],
-                            "id": "SKIP_ID",
-                            "title": "Skip",
-                            "description": "Action skip",
-                            "diagnosis": "User skip",
-                            "remediations": "move on",
-                            "variables": {},
-                        },
+                        "result": _expected_message(
+                            STATUS_SKIP,
+                            "SKIP_ID",
+                            title="Skip",
+                            description="Action skip",
+                            diagnosis="User skip",
+                            remediations="move on",
+                        ),
                     },
                     "Three": {
                         "messages": [
-                            {
-                                "level": STATUS_CODE["WARNING"],
-                                "id": "WARNING_ID",
-                                "title": "Warning",
-                                "description": "Action warning",
-                                "diagnosis": "User warning",
-                                "remediations": "move on",
-                                "variables": {},
-                            }
+                            _expected_message(
+                                STATUS_WARNING,
+                                "WARNING_ID",
+                                title="Warning",
+                                description="Action warning",
+                                diagnosis="User warning",
+                                remediations="move on",
+                            )
                         ],
-                        "result": {
-                            "level": STATUS_CODE["SUCCESS"],
-                            "id": "SUCCESS",
-                            "title": "",
-                            "description": "",
-                            "diagnosis": "",
-                            "remediations": "",
-                            "variables": {},
-                        },
+                        "result": _expected_message(STATUS_SUCCESS, "SUCCESS"),
                     },
                 },
             ),
         ),
     )
-    def test_run_post_actions_with_messages(self, action_results, expected, monkeypatch):
-        check_deps_mock = mock.Mock()
-        run_mock = mock.Mock(return_value=action_results)
-
-        monkeypatch.setattr(actions.Stage, "check_dependencies", check_deps_mock)
-        monkeypatch.setattr(actions.Stage, "run", run_mock)
+    def test_run_post_actions_with_messages(self, action_results, expected, stage_mocks):
+        _, run_mock = stage_mocks
+        run_mock.return_value = _make_finished_actions(*action_results)
 
         results = actions.run_post_actions()
         assert results == expected
@@ -2191,10 +2145,10 @@ class TestRunActions:
 
 class TestFindFailedActions:
     test_results = {
-        "BAD": {"result": {"level": STATUS_CODE["ERROR"], "id": "ERROR", "message": "Explosion"}},
-        "BAD2": {"result": {"level": STATUS_CODE["OVERRIDABLE"], "id": "OVERRIDABLE", "message": "Explosion"}},
-        "BAD3": {"result": {"level": STATUS_CODE["SKIP"], "id": "SKIP", "message": "Explosion"}},
-        "GOOD": {"result": {"level": STATUS_CODE["SUCCESS"], "id": "SUCCESS", "message": "No Error here"}},
+        "BAD": {"result": {"level": STATUS_ERROR, "id": "ERROR", "message": "Explosion"}},
+        "BAD2": {"result": {"level": STATUS_OVERRIDABLE, "id": "OVERRIDABLE", "message": "Explosion"}},
+        "BAD3": {"result": {"level": STATUS_SKIP, "id": "SKIP", "message": "Explosion"}},
+        "GOOD": {"result": {"level": STATUS_SUCCESS, "id": "SUCCESS", "message": "No Error here"}},
     }
 
     @pytest.mark.parametrize(
@@ -2207,8 +2161,8 @@ class TestFindFailedActions:
         ),
     )
     def test_find_actions_of_severity(self, severity, expected_ids, key):
-        found_action_ids = sorted(a[0] for a in actions.find_actions_of_severity(self.test_results, severity, key))
-        assert sorted(found_action_ids) == sorted(expected_ids)
+        found_action_ids = frozenset(a[0] for a in actions.find_actions_of_severity(self.test_results, severity, key))
+        assert found_action_ids == frozenset(expected_ids)
 
 
 class TestActionClasses:
@@ -2224,7 +2178,7 @@ class TestActionClasses:
                 None,
                 {
                     "id": "SUCCESS",
-                    "level": STATUS_CODE["SUCCESS"],
+                    "level": STATUS_SUCCESS,
                     "title": "",
                     "description": "",
                     "diagnosis": "",
@@ -2241,7 +2195,7 @@ class TestActionClasses:
                 "skip remediations",
                 {
                     "id": "SKIP_ID",
-                    "level": STATUS_CODE["SKIP"],
+                    "level": STATUS_SKIP,
                     "title": "Skip message",
                     "description": "skip description",
                     "diagnosis": "skip diagnosis",
@@ -2258,7 +2212,7 @@ class TestActionClasses:
                 "overridable remediations",
                 {
                     "id": "OVERRIDABLE_ID",
-                    "level": STATUS_CODE["OVERRIDABLE"],
+                    "level": STATUS_OVERRIDABLE,
                     "title": "Overridable message",
                     "description": "overridable description",
                     "diagnosis": "overridable diagnosis",
@@ -2275,7 +2229,7 @@ class TestActionClasses:
                 "error remediations",
                 {
                     "id": "ERROR_ID",
-                    "level": STATUS_CODE["ERROR"],
+                    "level": STATUS_ERROR,
                     "title": "Error message",
                     "description": "error description",
                     "diagnosis": "error diagnosis",
@@ -2371,7 +2325,7 @@ class TestActionClasses:
                 "warning remediations",
                 {
                     "id": "WARNING_ID",
-                    "level": STATUS_CODE["WARNING"],
+                    "level": STATUS_WARNING,
                     "title": "Warning message",
                     "description": "warning description",
                     "diagnosis": "warning diagnosis",
@@ -2388,7 +2342,7 @@ class TestActionClasses:
                 "info remediations",
                 {
                     "id": "INFO_ID",
-                    "level": STATUS_CODE["INFO"],
+                    "level": STATUS_INFO,
                     "title": "Info message",
                     "description": "info description",
                     "diagnosis": "info diagnosis",
@@ -2405,7 +2359,7 @@ class TestActionClasses:
                 "info remediations",
                 {
                     "id": "INFO_ID",
-                    "level": STATUS_CODE["INFO"],
+                    "level": STATUS_INFO,
                     "title": "Info message",
                     "description": "info description",
                     "diagnosis": "info diagnosis",
@@ -2523,7 +2477,7 @@ class TestActionClasses:
                 {},
                 {
                     "id": "SUCCESS_ID",
-                    "level": STATUS_CODE["SUCCESS"],
+                    "level": STATUS_SUCCESS,
                     "title": "",
                     "description": "",
                     "diagnosis": "",
@@ -2541,7 +2495,7 @@ class TestActionClasses:
                 {},
                 {
                     "id": "SKIP_ID",
-                    "level": STATUS_CODE["SKIP"],
+                    "level": STATUS_SKIP,
                     "title": "Skip",
                     "description": "skip description",
                     "diagnosis": "skip diagnosis",
@@ -2559,7 +2513,7 @@ class TestActionClasses:
                 {},
                 {
                     "id": "OVERRIDABLE_ID",
-                    "level": STATUS_CODE["OVERRIDABLE"],
+                    "level": STATUS_OVERRIDABLE,
                     "title": "Overridable",
                     "description": "overridable description",
                     "diagnosis": "overridable diagnosis",
@@ -2577,7 +2531,7 @@ class TestActionClasses:
                 {},
                 {
                     "id": "ERROR_ID",
-                    "level": STATUS_CODE["ERROR"],
+                    "level": STATUS_ERROR,
                     "title": "Error",
                     "description": "error description",
                     "diagnosis": "error diagnosis",
@@ -2604,14 +2558,14 @@ class TestActionClasses:
     ("status_code", "action_id", "id", "result", "expected"),
     (
         (
-            STATUS_CODE["SUCCESS"],
+            STATUS_SUCCESS,
             "Test",
             "SUCCESS",
             {},
             "(SUCCESS) Test::SUCCESS - N/A",
         ),
         (
-            STATUS_CODE["WARNING"],
+            STATUS_WARNING,
             "Test",
             "TestID",
             {
@@ -2623,7 +2577,7 @@ class TestActionClasses:
             "(WARNING) Test::TestID - A normal title\n Description: A normal description\n Diagnosis: A normal diagnosis\n Remediations: A normal remediations\n",
         ),
         (
-            STATUS_CODE["ERROR"],
+            STATUS_ERROR,
             "Test",
             "TestID",
             {
@@ -2635,7 +2589,7 @@ class TestActionClasses:
             "(ERROR) Test::TestID - A normal title\n Description: N/A\n Diagnosis: A normal diagnosis\n Remediations: A normal remediations\n",
         ),
         (
-            STATUS_CODE["ERROR"],
+            STATUS_ERROR,
             "Test",
             "TestID",
             {
@@ -2657,80 +2611,68 @@ def test_format_action_status_message(status_code, action_id, id, result, expect
     ("results", "expected"),
     (
         (
-            actions.FinishedActions(
-                [
-                    _ActionForTesting(id="Three", messages=[], result=ActionResult(level="SUCCESS", id="SUCCESS")),
-                ],
+            (
+                [{"id": "Three", "messages": [], "result": {"level": "SUCCESS", "id": "SUCCESS"}}],
                 [
-                    _ActionForTesting(
-                        id="One",
-                        messages=[],
-                        result=ActionResult(
-                            level="ERROR",
-                            id="ERROR_ID",
-                            title="Error",
-                            description="Action error",
-                            diagnosis="User error",
-                            remediations="move on",
-                        ),
-                    ),
+                    {
+                        "id": "One",
+                        "messages": [],
+                        "result": {
+                            "level": "ERROR",
+                            "id": "ERROR_ID",
+                            "title": "Error",
+                            "description": "Action error",
+                            "diagnosis": "User error",
+                            "remediations": "move on",
+                        },
+                    }
                 ],
                 [
-                    _ActionForTesting(
-                        id="Two",
-                        messages=[],
-                        result=ActionResult(
-                            level="SKIP",
-                            id="SKIP_ID",
-                            title="Skip",
-                            description="Action skip",
-                            diagnosis="User skip",
-                            remediations="move on",
-                        ),
-                    ),
+                    {
+                        "id": "Two",
+                        "messages": [],
+                        "result": {
+                            "level": "SKIP",
+                            "id": "SKIP_ID",
+                            "title": "Skip",
+                            "description": "Action skip",
+                            "diagnosis": "User skip",
+                            "remediations": "move on",
+                        },
+                    }
                 ],
             ),
             {
                 "One": {
                     "messages": [],
-                    "result": {
-                        "level": STATUS_CODE["ERROR"],
-                        "id": "ERROR_ID",
-                        "title": "Error",
-                        "description": "Action error",
-                        "diagnosis": "User error",
-                        "remediations": "move on",
-                        "variables": {},
-                    },
+                    "result": _expected_message(
+                        STATUS_ERROR,
+                        "ERROR_ID",
+                        title="Error",
+                        description="Action error",
+                        diagnosis="User error",
+                        remediations="move on",
+                    ),
                 },
                 "Two": {
                     "messages": [],
-                    "result": {
-                        "level": STATUS_CODE["SKIP"],
-                        "id": "SKIP_ID",
-                        "title": "Skip",
-                        "description": "Action skip",
-                        "diagnosis": "User skip",
-                        "remediations": "move on",
-                        "variables": {},
-                    },
+                    "result": _expected_message(
+                        STATUS_SKIP,
+                        "SKIP_ID",
+                        title="Skip",
+                        description="Action skip",
+                        diagnosis="User skip",
+                        remediations="move on",
+                    ),
                 },
                 "Three": {
                     "messages": [],
-                    "result": {
-                        "level": STATUS_CODE["SUCCESS"],
-                        "id": "SUCCESS",
-                        "title": "",
-                        "description": "",
-                        "diagnosis": "",
-                        "remediations": "",
-                        "variables": {},
-                    },
+                    "result": _expected_message(STATUS_SUCCESS, "SUCCESS"),
                 },
             },
         ),
-        ({}, {}),
+        (([], [], []), {}),
     ),
 )
 def test_parse_action_results(results, expected):
-    assert actions.parse_action_results(results) == expected
+    assert actions.parse_action_results(_make_finished_actions(*results)) == expected
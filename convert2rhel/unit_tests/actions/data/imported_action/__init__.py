@@ -0,0 +1 @@
+__metaclass__ = type
@@ -0,0 +1,11 @@
+__metaclass__ = type
+
+from convert2rhel import actions
+from convert2rhel.unit_tests.actions.data.only_subclasses_of_action.test import RealTest
+
+
+class OwnTest(actions.Action):
+    id = "OWNTEST"
+
+    def run(self):
+        pass
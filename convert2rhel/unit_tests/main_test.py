@@ -51,13 +51,53 @@ from convert2rhel.unit_tests import (
 )
 
 
+#: Messages that main.provide_status_after_rollback() can log.
+ROLLBACK_FAILED_HEADER = "Rollback of system wasn't completed successfully.\n"
+ROLLBACK_FAILED_MSG = (
+    ROLLBACK_FAILED_HEADER + "The system is left in an undetermined state that Convert2RHEL cannot fix.\n"
+    "It is strongly recommended to store the Convert2RHEL logs for later investigation, and restore"
+    " the system from a backup.\n"
+    "Following errors were captured during rollback:\n"
+)
+CONVERSION_INTERRUPTED_MSG = "\nConversion interrupted before analysis of system completed. Report not generated.\n"
+NO_PROBLEMS_MSG = "No problems detected during the analysis!\n"
+
+
+def _single_action_results(action_id, level, result_id, title="", description="", diagnosis="", remediations=""):
+    """
+    Build the raw results of an Action framework run which ran a single Action.
+
+    :param action_id: Id of the Action which was run.
+    :param level: Name of the result's level in actions.STATUS_CODE.
+    :param result_id: Id of the Action's result.
+    """
+    return {
+        action_id: {
+            "messages": [],
+            "result": {
+                "level": actions.STATUS_CODE[level],
+                "id": result_id,
+                "title": title,
+                "description": description,
+                "diagnosis": diagnosis,
+                "remediations": remediations,
+                "variables": {},
+            },
+        },
+    }
+
+
+#: Pre-conversion results in which the only action succeeded.
+SUCCESSFUL_PRE_CONVERSION_RESULTS = _single_action_results("PreSubscription", "SUCCESS", "SUCCESS")
+
+
 class TestRollbackChanges:
     def test_rollback_changes(self, monkeypatch, global_backup_control):
         monkeypatch.setattr(global_backup_control, "pop_all", mock.Mock())
 
         main.rollback_changes()
 
-        assert global_backup_control.pop_all.call_args_list == mock.call()
+        global_backup_control.pop_all.assert_called_once_with()
         assert backup.backup_control.rollback_failed == False
 
     def test_backup_control_unknown_exception(self, monkeypatch, global_backup_control):
@@ -77,70 +117,34 @@ class TestRollbackChanges:
                 "anything",
                 False,
                 ["rollback_fail_0", "rollback_fail_1", "rollback_fail_2", "rollback_fail_3"],
-                "Rollback of system wasn't completed successfully.\n"
-                "The system is left in an undetermined state that Convert2RHEL cannot fix.\n"
-                "It is strongly recommended to store the Convert2RHEL logs for later investigation, and restore"
-                " the system from a backup.\n"
-                "Following errors were captured during rollback:\n"
-                "rollback_fail_0\n"
-                "rollback_fail_1\n"
-                "rollback_fail_2\n"
-                "rollback_fail_3",
-                [
-                    "\nConversion interrupted before analysis of system completed. Report not generated.\n",
-                    "No problems detected during the analysis!\n",
-                ],
+                ROLLBACK_FAILED_MSG + "rollback_fail_0\nrollback_fail_1\nrollback_fail_2\nrollback_fail_3",
+                [CONVERSION_INTERRUPTED_MSG, NO_PROBLEMS_MSG],
             ),
             (
                 "anything",
                 False,
                 ["rollback_fail_0"],
-                "Rollback of system wasn't completed successfully.\n"
-                "The system is left in an undetermined state that Convert2RHEL cannot fix.\n"
-                "It is strongly recommended to store the Convert2RHEL logs for later investigation, and restore"
-                " the system from a backup.\n"
-                "Following errors were captured during rollback:\n"
-                "rollback_fail_0",
-                [
-                    "\nConversion interrupted before analysis of system completed. Report not generated.\n",
-                    "No problems detected during the analysis!\n",
-                ],
+                ROLLBACK_FAILED_MSG + "rollback_fail_0",
+                [CONVERSION_INTERRUPTED_MSG, NO_PROBLEMS_MSG],
             ),
             (
-                {
-                    "PreSubscription": {
-                        "messages": [],
-                        "result": {
-                            "level": actions.STATUS_CODE["SUCCESS"],
-                            "id": "SUCCESS",
-                            "title": "",
-                            "description": "",
-                            "diagnosis": "",
-                            "remediations": "",
-                            "variables": {},
-                        },
-                    }
-                },
+                SUCCESSFUL_PRE_CONVERSION_RESULTS,
                 False,
                 [],
                 "No problems detected!\n",
-                [
-                    "Rollback of system wasn't completed successfully.\n",
-                    "\nConversion interrupted before analysis of system completed. Report not generated.\n",
-                ],
+                [ROLLBACK_FAILED_HEADER, CONVERSION_INTERRUPTED_MSG],
             ),
             (
                 None,
                 True,
                 [],
-                "\nConversion interrupted before analysis of system completed. Report not generated.\n",
-                ["Rollback of system wasn't completed successfully.\n", "No problems detected during the analysis!\n"],
+                CONVERSION_INTERRUPTED_MSG,
+                [ROLLBACK_FAILED_HEADER, NO_PROBLEMS_MSG],
             ),
         ),
     )
     def test_provide_status_after_rollback(
         self,
-        monkeypatch,
         caplog,
         pre_conversion_results,
         include_all_reports,
@@ -149,13 +153,14 @@ class TestRollbackChanges:
         rollback_failures,
         not_printed_message,
     ):
-        monkeypatch.setattr(global_backup_control, "_rollback_failures", rollback_failures)
+        global_backup_control._rollback_failures = rollback_failures
 
         main.provide_status_after_rollback(pre_conversion_results, include_all_reports)
 
-        assert message == caplog.records[-1].message
+        messages = [record.message for record in caplog.records]
+        assert message == messages[-1]
         for not_printed in not_printed_message:
-            assert not_printed not in caplog.text
+            assert not any(not_printed in logged for logged in messages)
 
 
 @pytest.mark.parametrize(("exception_type", "exception"), ((IOError, True), (OSError, True), (None, False)))
@@ -228,14 +233,21 @@ def test_post_ponr_conversion(monkeypatch):
     assert lock_releasever_in_rhel_repositories_mock.call_count == 1
 
 
-def test_help_exit(monkeypatch, tmp_path):
+@pytest.fixture
+def fake_applock(monkeypatch):
+    """
+    Replace ApplicationLock with a MagicMock so main.main() does not create a lock file on disk.
+    """
+    monkeypatch.setattr(applock, "ApplicationLock", mock.MagicMock())
+
+
+def test_help_exit(monkeypatch, fake_applock):
     """
     Check that --help exits before we enter main_locked().
 
     We need special handling to deal with --help's exit if it occurs inside of the try: except in
     main_locked(). (Consult git history for main.py if the special handling needs to be resurrected.
     """
-    monkeypatch.setattr(applock, "_DEFAULT_LOCK_DIR", str(tmp_path))
     monkeypatch.setattr(sys, "argv", ["convert2rhel", "--help"])
     monkeypatch.setattr(utils, "require_root", RequireRootMocked())
     monkeypatch.setattr(main, "initialize_file_logging", InitializeFileLoggingMocked())
@@ -247,113 +259,307 @@ def test_help_exit(monkeypatch, tmp_path):
     assert main.main_locked.call_count == 0
 
 
-def test_main(monkeypatch, tmp_path):
-    require_root_mock = mock.Mock()
-    initialize_file_logging_mock = mock.Mock()
-    toolopts_cli_mock = mock.Mock()
-    show_eula_mock = mock.Mock()
-    print_data_collection_mock = mock.Mock()
-    resolve_system_info_mock = mock.Mock()
-    print_system_information_mock = mock.Mock()
-    collect_early_data_mock = mock.Mock()
-    clean_yum_metadata_mock = mock.Mock()
-    raise_for_skipped_failures_mock = mock.Mock()
-    report_summary_mock = mock.Mock()
-    run_pre_actions_mock = mock.Mock()
-    run_post_actions_mock = mock.Mock()
-    clear_versionlock_mock = mock.Mock()
-    ask_to_continue_mock = mock.Mock()
-    post_ponr_conversion_mock = mock.Mock()
-    rpm_files_diff_mock = mock.Mock()
-    update_grub_after_conversion_mock = mock.Mock()
-    remove_tmp_dir_mock = mock.Mock()
-    restart_system_mock = mock.Mock()
-    finish_collection_mock = mock.Mock()
-    check_kernel_boot_files_mock = mock.Mock()
-    update_rhsm_custom_facts_mock = mock.Mock()
-    summary_as_json_mock = mock.Mock()
-    summary_as_txt_mock = mock.Mock()
-    configure_host_metering_mock = mock.Mock()
-
-    monkeypatch.setattr(applock, "_DEFAULT_LOCK_DIR", str(tmp_path))
-    monkeypatch.setattr(utils, "require_root", require_root_mock)
-    monkeypatch.setattr(main, "initialize_file_logging", initialize_file_logging_mock)
-    monkeypatch.setattr(toolopts, "CLI", toolopts_cli_mock)
-    monkeypatch.setattr(main, "show_eula", show_eula_mock)
-    monkeypatch.setattr(breadcrumbs, "print_data_collection", print_data_collection_mock)
-    monkeypatch.setattr(system_info, "resolve_system_info", resolve_system_info_mock)
-    monkeypatch.setattr(system_info, "print_system_information", print_system_information_mock)
-    monkeypatch.setattr(breadcrumbs, "collect_early_data", collect_early_data_mock)
-    monkeypatch.setattr(pkghandler, "clear_versionlock", clear_versionlock_mock)
-    monkeypatch.setattr(pkgmanager, "clean_yum_metadata", clean_yum_metadata_mock)
-    monkeypatch.setattr(actions, "run_pre_actions", run_pre_actions_mock)
-    monkeypatch.setattr(actions, "run_post_actions", run_post_actions_mock)
-    monkeypatch.setattr(main, "_raise_for_skipped_failures", raise_for_skipped_failures_mock)
-    monkeypatch.setattr(report, "_summary", report_summary_mock)
-    monkeypatch.setattr(utils, "ask_to_continue", ask_to_continue_mock)
-    monkeypatch.setattr(main, "post_ponr_conversion", post_ponr_conversion_mock)
-    monkeypatch.setattr(system_info, "modified_rpm_files_diff", rpm_files_diff_mock)
-    monkeypatch.setattr(grub, "update_grub_after_conversion", update_grub_after_conversion_mock)
-    monkeypatch.setattr(utils, "remove_tmp_dir", remove_tmp_dir_mock)
-    monkeypatch.setattr(utils, "restart_system", restart_system_mock)
-    monkeypatch.setattr(breadcrumbs, "finish_collection", finish_collection_mock)
-    monkeypatch.setattr(checks, "check_kernel_boot_files", check_kernel_boot_files_mock)
-    monkeypatch.setattr(subscription, "update_rhsm_custom_facts", update_rhsm_custom_facts_mock)
-    monkeypatch.setattr(report, "summary_as_json", summary_as_json_mock)
-    monkeypatch.setattr(report, "summary_as_txt", summary_as_txt_mock)
-    monkeypatch.setattr(hostmetering, "configure_host_metering", configure_host_metering_mock)
+#: Functions which main.main() calls in every phase of a conversion.  The
+#: main_mocks fixture replaces each of these with a Mock.
+MAIN_COMMON_PATCHES = (
+    (utils, "require_root"),
+    (main, "initialize_file_logging"),
+    (toolopts, "CLI"),
+    (main, "show_eula"),
+    (breadcrumbs, "print_data_collection"),
+    (system_info, "resolve_system_info"),
+    (system_info, "print_system_information"),
+    (breadcrumbs, "collect_early_data"),
+    (pkghandler, "clear_versionlock"),
+    (pkgmanager, "clean_yum_metadata"),
+    (actions, "run_pre_actions"),
+    (breadcrumbs, "finish_collection"),
+    (subscription, "update_rhsm_custom_facts"),
+    (report, "summary_as_json"),
+    (report, "summary_as_txt"),
+)
+
+
+@pytest.fixture
+def main_mocks(monkeypatch, fake_applock, request):
+    """
+    Replace the functions that main.main() calls with Mocks.
+
+    Tests can parametrize this fixture indirectly with (module, attribute,
+    mock keyword arguments) entries to patch on top of the common ones, for
+    instance to make one of the functions raise or to mock out additional
+    functions.  The Mocks are created anew for every test run.
+    """
+    for module, function in MAIN_COMMON_PATCHES:
+        monkeypatch.setattr(module, function, mock.Mock())
+
+    for module, function, mock_kwargs in getattr(request, "param", ()):
+        monkeypatch.setattr(module, function, mock.Mock(**mock_kwargs))
+
+
+def _assert_call_counts(call_counts):
+    """
+    Check how many times each mocked function was called.
+
+    :param call_counts: (module, function name, expected call count) entries.
+        The module can also be an object such as breadcrumbs or system_info.
+    """
+    actual = {}
+    expected = {}
+    for module, function, call_count in call_counts:
+        name = "%s.%s" % (getattr(module, "__name__", type(module).__name__), function)
+        actual[name] = getattr(module, function).call_count
+        expected[name] = call_count
+
+    assert actual == expected
+
+
+@pytest.mark.parametrize(
+    "main_mocks",
+    (
+        (
+            (actions, "run_post_actions", {}),
+            (main, "_raise_for_skipped_failures", {}),
+            (report, "_summary", {}),
+            (utils, "ask_to_continue", {}),
+            (main, "post_ponr_conversion", {}),
+            (system_info, "modified_rpm_files_diff", {}),
+            (grub, "update_grub_after_conversion", {}),
+            (utils, "remove_tmp_dir", {}),
+            (utils, "restart_system", {}),
+            (checks, "check_kernel_boot_files", {}),
+            (hostmetering, "configure_host_metering", {}),
+        ),
+    ),
+    indirect=True,
+)
+def test_main(main_mocks):
 
     assert main.main() == 0
-    assert require_root_mock.call_count == 1
-    assert initialize_file_logging_mock.call_count == 1
-    assert toolopts_cli_mock.call_count == 1
-    assert show_eula_mock.call_count == 1
-    assert print_data_collection_mock.call_count == 1
-    assert resolve_system_info_mock.call_count == 1
-    assert collect_early_data_mock.call_count == 1
-    assert clean_yum_metadata_mock.call_count == 1
-    assert run_pre_actions_mock.call_count == 1
-    assert run_post_actions_mock.call_count == 1
-    assert raise_for_skipped_failures_mock.call_count == 2
-    assert report_summary_mock.call_count == 2
-    assert clear_versionlock_mock.call_count == 1
-    assert ask_to_continue_mock.call_count == 1
-    assert post_ponr_conversion_mock.call_count == 1
-    assert rpm_files_diff_mock.call_count == 1
-    assert remove_tmp_dir_mock.call_count == 1
-    assert restart_system_mock.call_count == 1
-    assert finish_collection_mock.call_count == 1
-    assert check_kernel_boot_files_mock.call_count == 1
-    assert update_rhsm_custom_facts_mock.call_count == 1
-    assert summary_as_json_mock.call_count == 1
-    assert summary_as_txt_mock.call_count == 1
+    _assert_call_counts(
+        (
+            (utils, "require_root", 1),
+            (main, "initialize_file_logging", 1),
+            (toolopts, "CLI", 1),
+            (main, "show_eula", 1),
+            (breadcrumbs, "print_data_collection", 1),
+            (system_info, "resolve_system_info", 1),
+            (breadcrumbs, "collect_early_data", 1),
+            (pkgmanager, "clean_yum_metadata", 1),
+            (actions, "run_pre_actions", 1),
+            (actions, "run_post_actions", 1),
+            (main, "_raise_for_skipped_failures", 2),
+            (report, "_summary", 2),
+            (pkghandler, "clear_versionlock", 1),
+            (utils, "ask_to_continue", 1),
+            (main, "post_ponr_conversion", 1),
+            (system_info, "modified_rpm_files_diff", 1),
+            (grub, "update_grub_after_conversion", 1),
+            (utils, "remove_tmp_dir", 1),
+            (utils, "restart_system", 1),
+            (breadcrumbs, "finish_collection", 1),
+            (checks, "check_kernel_boot_files", 1),
+            (hostmetering, "configure_host_metering", 1),
+            (subscription, "update_rhsm_custom_facts", 1),
+            (report, "summary_as_json", 1),
+            (report, "summary_as_txt", 1),
+        )
+    )
 
 
 class TestRollbackFromMain:
-    def test_main_rollback_post_cli_phase(self, monkeypatch, caplog, tmp_path):
-        require_root_mock = mock.Mock()
-        initialize_file_logging_mock = mock.Mock()
-        toolopts_cli_mock = mock.Mock()
-        show_eula_mock = mock.Mock(side_effect=Exception)
-        finish_collection_mock = mock.Mock()
-
-        monkeypatch.setattr(applock, "_DEFAULT_LOCK_DIR", str(tmp_path))
-        monkeypatch.setattr(utils, "require_root", require_root_mock)
-        monkeypatch.setattr(main, "initialize_file_logging", initialize_file_logging_mock)
-        monkeypatch.setattr(toolopts, "CLI", toolopts_cli_mock)
-        monkeypatch.setattr(main, "show_eula", show_eula_mock)
-        monkeypatch.setattr(breadcrumbs, "finish_collection", finish_collection_mock)
+    @pytest.mark.parametrize(
+        ("main_mocks", "activity", "return_code", "call_counts", "log_messages"),
+        (
+            pytest.param(
+                ((main, "show_eula", {"side_effect": Exception}),),
+                None,
+                1,
+                (
+                    (utils, "require_root", 1),
+                    (main, "initialize_file_logging", 1),
+                    (toolopts, "CLI", 1),
+                    (main, "show_eula", 1),
+                    (breadcrumbs, "finish_collection", 1),
+                ),
+                ("No changes were made to the system.",),
+                id="post-cli",
+            ),
+            pytest.param(
+                (
+                    (actions, "run_pre_actions", {"side_effect": Exception("Action Framework Crashed")}),
+                    (subscription, "should_subscribe", {"return_value": False}),
+                    (main, "rollback_changes", {}),
+                ),
+                None,
+                1,
+                (
+                    (utils, "require_root", 1),
+                    (main, "initialize_file_logging", 1),
+                    (toolopts, "CLI", 1),
+                    (main, "show_eula", 1),
+                    (breadcrumbs, "print_data_collection", 1),
+                    (system_info, "resolve_system_info", 1),
+                    (breadcrumbs, "collect_early_data", 1),
+                    (pkgmanager, "clean_yum_metadata", 1),
+                    (actions, "run_pre_actions", 1),
+                    (pkghandler, "clear_versionlock", 1),
+                    (breadcrumbs, "finish_collection", 1),
+                    (subscription, "should_subscribe", 1),
+                    (subscription, "update_rhsm_custom_facts", 1),
+                    (main, "rollback_changes", 1),
+                    (report, "summary_as_json", 0),
+                    (report, "summary_as_txt", 0),
+                ),
+                (
+                    "Conversion interrupted before analysis of system completed. Report not generated.",
+                    "Action Framework Crashed",
+                ),
+                id="before-action-completion",
+            ),
+            pytest.param(
+                (
+                    (report, "_summary", {}),
+                    (actions, "find_actions_of_severity", {}),
+                    (subscription, "should_subscribe", {"return_value": False}),
+                    (main, "rollback_changes", {}),
+                ),
+                None,
+                2,
+                (
+                    (utils, "require_root", 1),
+                    (main, "initialize_file_logging", 1),
+                    (toolopts, "CLI", 1),
+                    (main, "show_eula", 1),
+                    (breadcrumbs, "print_data_collection", 1),
+                    (system_info, "resolve_system_info", 1),
+                    (breadcrumbs, "collect_early_data", 1),
+                    (pkgmanager, "clean_yum_metadata", 1),
+                    (actions, "run_pre_actions", 1),
+                    (report, "_summary", 1),
+                    (actions, "find_actions_of_severity", 1),
+                    (pkghandler, "clear_versionlock", 1),
+                    (breadcrumbs, "finish_collection", 1),
+                    (subscription, "should_subscribe", 1),
+                    (subscription, "update_rhsm_custom_facts", 1),
+                    (main, "rollback_changes", 1),
+                    (report, "summary_as_json", 1),
+                    (report, "summary_as_txt", 1),
+                ),
+                (),
+                id="pre-ponr-changes",
+            ),
+            # The system needs to be registered during the analysis.  It will
+            # be unregistered again in the end, so update_rhsm_custom_facts
+            # must not be called.
+            pytest.param(
+                (
+                    (report, "_summary", {}),
+                    (subscription, "should_subscribe", {"return_value": True}),
+                    (main, "rollback_changes", {}),
+                ),
+                "analysis",
+                0,
+                (
+                    (utils, "require_root", 1),
+                    (toolopts, "CLI", 1),
+                    (main, "show_eula", 1),
+                    (breadcrumbs, "print_data_collection", 1),
+                    (system_info, "resolve_system_info", 1),
+                    (system_info, "print_system_information", 1),
+                    (breadcrumbs, "collect_early_data", 1),
+                    (pkghandler, "clear_versionlock", 1),
+                    (pkgmanager, "clean_yum_metadata", 1),
+                    (actions, "run_pre_actions", 1),
+                    (report, "_summary", 1),
+                    (breadcrumbs, "finish_collection", 1),
+                    (subscription, "should_subscribe", 1),
+                    (subscription, "update_rhsm_custom_facts", 0),
+                    (main, "rollback_changes", 1),
+                    (report, "summary_as_json", 1),
+                    (report, "summary_as_txt", 1),
+                ),
+                (),
+                id="analyze-exit-without-subman",
+            ),
+            pytest.param(
+                (
+                    (report, "_summary", {}),
+                    (subscription, "should_subscribe", {"return_value": False}),
+                    (main, "rollback_changes", {}),
+                ),
+                "analysis",
+                0,
+                (
+                    (utils, "require_root", 1),
+                    (main, "initialize_file_logging", 1),
+                    (toolopts, "CLI", 1),
+                    (main, "show_eula", 1),
+                    (breadcrumbs, "print_data_collection", 1),
+                    (system_info, "resolve_system_info", 1),
+                    (breadcrumbs, "collect_early_data", 1),
+                    (pkgmanager, "clean_yum_metadata", 1),
+                    (actions, "run_pre_actions", 1),
+                    (report, "_summary", 1),
+                    (pkghandler, "clear_versionlock", 1),
+                    (breadcrumbs, "finish_collection", 1),
+                    (subscription, "should_subscribe", 1),
+                    (subscription, "update_rhsm_custom_facts", 1),
+                    (main, "rollback_changes", 1),
+                    (report, "summary_as_json", 1),
+                    (report, "summary_as_txt", 1),
+                ),
+                (),
+                id="analyze-exit",
+            ),
+            pytest.param(
+                (
+                    (actions, "run_post_actions", {}),
+                    (actions, "find_actions_of_severity", {"return_value": []}),
+                    (report, "_summary", {}),
+                    (utils, "ask_to_continue", {}),
+                    (main, "post_ponr_conversion", {"side_effect": Exception}),
+                ),
+                None,
+                1,
+                (
+                    (utils, "require_root", 1),
+                    (main, "initialize_file_logging", 1),
+                    (toolopts, "CLI", 1),
+                    (main, "show_eula", 1),
+                    (breadcrumbs, "print_data_collection", 1),
+                    (system_info, "resolve_system_info", 1),
+                    (breadcrumbs, "collect_early_data", 1),
+                    (pkgmanager, "clean_yum_metadata", 1),
+                    (actions, "run_pre_actions", 1),
+                    (actions, "find_actions_of_severity", 1),
+                    (pkghandler, "clear_versionlock", 1),
+                    (report, "_summary", 2),
+                    (utils, "ask_to_continue", 1),
+                    (main, "post_ponr_conversion", 1),
+                    (breadcrumbs, "finish_collection", 1),
+                    (report, "summary_as_json", 1),
+                    (report, "summary_as_txt", 1),
+                    (subscription, "update_rhsm_custom_facts", 1),
+                ),
+                ("The system is left in an undetermined state that Convert2RHEL cannot fix.",),
+                id="post-ponr-changes",
+            ),
+        ),
+        indirect=["main_mocks"],
+    )
+    def test_main_rollback(
+        self, main_mocks, activity, return_code, call_counts, log_messages, global_tool_opts, caplog
+    ):
+        global_tool_opts.activity = activity
 
-        assert main.main() == 1
-        assert require_root_mock.call_count == 1
-        assert initialize_file_logging_mock.call_count == 1
-        assert toolopts_cli_mock.call_count == 1
-        assert show_eula_mock.call_count == 1
-        assert finish_collection_mock.call_count == 1
-        assert "No changes were made to the system." in caplog.records[-2].message
-
-    def test_main_traceback_in_clear_versionlock(self, caplog, monkeypatch, tmp_path):
-        monkeypatch.setattr(applock, "_DEFAULT_LOCK_DIR", str(tmp_path))
+        assert main.main() == return_code
+        _assert_call_counts(call_counts)
+        logged = [record.message for record in caplog.records]
+        for message in log_messages:
+            assert any(message in logged_message for logged_message in logged), message
+
+    def test_main_traceback_in_clear_versionlock(self, caplog, monkeypatch, fake_applock):
         monkeypatch.setattr(utils, "require_root", RequireRootMocked())
         monkeypatch.setattr(main, "initialize_file_logging", InitializeFileLoggingMocked())
         monkeypatch.setattr(toolopts, "CLI", CLIMocked())
@@ -380,420 +586,81 @@ class TestRollbackFromMain:
         monkeypatch.setattr(report, "summary_as_json", SummaryAsJsonMocked())
 
         assert main.main() == 1
-        assert utils.require_root.call_count == 1
-        assert toolopts.CLI.call_count == 1
-        assert main.show_eula.call_count == 1
-        assert breadcrumbs.print_data_collection.call_count == 1
-        assert system_info.resolve_system_info.call_count == 1
-        assert breadcrumbs.collect_early_data.call_count == 1
-        assert pkghandler.clear_versionlock.call_count == 1
-
-        assert main.rollback_changes.call_count == 0
-        assert main.provide_status_after_rollback.call_count == 0
+        _assert_call_counts(
+            (
+                (utils, "require_root", 1),
+                (toolopts, "CLI", 1),
+                (main, "show_eula", 1),
+                (breadcrumbs, "print_data_collection", 1),
+                (system_info, "resolve_system_info", 1),
+                (breadcrumbs, "collect_early_data", 1),
+                (pkghandler, "clear_versionlock", 1),
+                (main, "rollback_changes", 0),
+                (main, "provide_status_after_rollback", 0),
+            )
+        )
 
-        assert caplog.records[-2].levelname == "INFO"
-        assert caplog.records[-2].message.strip() == "No changes were made to the system."
+        assert caplog.records[-1].levelname == "INFO"
+        assert caplog.records[-1].message.strip() == "No changes were made to the system."
 
         critical_logs = [log for log in caplog.records if log.levelname == "CRITICAL"]
         assert len(critical_logs) == 1
         assert critical_logs[0].message == "Clearing lock failed"
 
-    def test_main_traceback_before_action_completion(self, monkeypatch, caplog, tmp_path):
-        require_root_mock = mock.Mock()
-        initialize_file_logging_mock = mock.Mock()
-        toolopts_cli_mock = mock.Mock()
-        show_eula_mock = mock.Mock()
-        print_data_collection_mock = mock.Mock()
-        resolve_system_info_mock = mock.Mock()
-        print_system_information_mock = mock.Mock()
-        collect_early_data_mock = mock.Mock()
-        clean_yum_metadata_mock = mock.Mock()
-        run_pre_actions_mock = mock.Mock(side_effect=Exception("Action Framework Crashed"))
-        clear_versionlock_mock = mock.Mock()
-        summary_as_txt_mock = mock.Mock()
-
-        # Mock the rollback calls
-        finish_collection_mock = mock.Mock()
-        should_subscribe_mock = mock.Mock(side_effect=lambda: False)
-        update_rhsm_custom_facts_mock = mock.Mock()
-        rollback_changes_mock = mock.Mock()
-        summary_as_json_mock = mock.Mock()
-
-        monkeypatch.setattr(applock, "_DEFAULT_LOCK_DIR", str(tmp_path))
-        monkeypatch.setattr(utils, "require_root", require_root_mock)
-        monkeypatch.setattr(main, "initialize_file_logging", initialize_file_logging_mock)
-        monkeypatch.setattr(toolopts, "CLI", toolopts_cli_mock)
-        monkeypatch.setattr(main, "show_eula", show_eula_mock)
-        monkeypatch.setattr(breadcrumbs, "print_data_collection", print_data_collection_mock)
-        monkeypatch.setattr(system_info, "resolve_system_info", resolve_system_info_mock)
-        monkeypatch.setattr(system_info, "print_system_information", print_system_information_mock)
-        monkeypatch.setattr(breadcrumbs, "collect_early_data", collect_early_data_mock)
-        monkeypatch.setattr(pkghandler, "clear_versionlock", clear_versionlock_mock)
-        monkeypatch.setattr(pkgmanager, "clean_yum_metadata", clean_yum_metadata_mock)
-        monkeypatch.setattr(actions, "run_pre_actions", run_pre_actions_mock)
-        monkeypatch.setattr(breadcrumbs, "finish_collection", finish_collection_mock)
-        monkeypatch.setattr(subscription, "should_subscribe", should_subscribe_mock)
-        monkeypatch.setattr(subscription, "update_rhsm_custom_facts", update_rhsm_custom_facts_mock)
-        monkeypatch.setattr(main, "rollback_changes", rollback_changes_mock)
-        monkeypatch.setattr(report, "summary_as_json", summary_as_json_mock)
-        monkeypatch.setattr(report, "summary_as_txt", summary_as_txt_mock)
 
-        assert main.main() == 1
-        assert require_root_mock.call_count == 1
-        assert initialize_file_logging_mock.call_count == 1
-        assert toolopts_cli_mock.call_count == 1
-        assert show_eula_mock.call_count == 1
-        assert print_data_collection_mock.call_count == 1
-        assert resolve_system_info_mock.call_count == 1
-        assert collect_early_data_mock.call_count == 1
-        assert clean_yum_metadata_mock.call_count == 1
-        assert run_pre_actions_mock.call_count == 1
-        assert clear_versionlock_mock.call_count == 1
-        assert finish_collection_mock.call_count == 1
-        assert should_subscribe_mock.call_count == 1
-        assert update_rhsm_custom_facts_mock.call_count == 1
-        assert rollback_changes_mock.call_count == 1
-        assert summary_as_json_mock.call_count == 0
-        assert summary_as_txt_mock.call_count == 0
-        assert (
-            caplog.records[-2].message.strip()
-            == "Conversion interrupted before analysis of system completed. Report not generated."
-        )
-        assert "Action Framework Crashed" in caplog.records[-3].message
-
-    def test_main_rollback_pre_ponr_changes_phase(self, monkeypatch, caplog, tmp_path):
-        require_root_mock = mock.Mock()
-        initialize_file_logging_mock = mock.Mock()
-        toolopts_cli_mock = mock.Mock()
-        show_eula_mock = mock.Mock()
-        print_data_collection_mock = mock.Mock()
-        resolve_system_info_mock = mock.Mock()
-        print_system_information_mock = mock.Mock()
-        collect_early_data_mock = mock.Mock()
-        clean_yum_metadata_mock = mock.Mock()
-        run_pre_actions_mock = mock.Mock()
-        report_summary_mock = mock.Mock()
-        clear_versionlock_mock = mock.Mock()
-        find_actions_of_severity_mock = mock.Mock()
-        summary_as_txt_mock = mock.Mock()
-
-        # Mock the rollback calls
-        finish_collection_mock = mock.Mock()
-        should_subscribe_mock = mock.Mock(side_effect=lambda: False)
-        update_rhsm_custom_facts_mock = mock.Mock()
-        rollback_changes_mock = mock.Mock()
-        summary_as_json_mock = mock.Mock()
-
-        monkeypatch.setattr(applock, "_DEFAULT_LOCK_DIR", str(tmp_path))
-        monkeypatch.setattr(utils, "require_root", require_root_mock)
-        monkeypatch.setattr(main, "initialize_file_logging", initialize_file_logging_mock)
-        monkeypatch.setattr(toolopts, "CLI", toolopts_cli_mock)
-        monkeypatch.setattr(main, "show_eula", show_eula_mock)
-        monkeypatch.setattr(breadcrumbs, "print_data_collection", print_data_collection_mock)
-        monkeypatch.setattr(system_info, "resolve_system_info", resolve_system_info_mock)
-        monkeypatch.setattr(system_info, "print_system_information", print_system_information_mock)
-        monkeypatch.setattr(breadcrumbs, "collect_early_data", collect_early_data_mock)
-        monkeypatch.setattr(pkghandler, "clear_versionlock", clear_versionlock_mock)
-        monkeypatch.setattr(pkgmanager, "clean_yum_metadata", clean_yum_metadata_mock)
-        monkeypatch.setattr(actions, "run_pre_actions", run_pre_actions_mock)
-        monkeypatch.setattr(report, "_summary", report_summary_mock)
-        monkeypatch.setattr(actions, "find_actions_of_severity", find_actions_of_severity_mock)
-        monkeypatch.setattr(breadcrumbs, "finish_collection", finish_collection_mock)
-        monkeypatch.setattr(subscription, "should_subscribe", should_subscribe_mock)
-        monkeypatch.setattr(subscription, "update_rhsm_custom_facts", update_rhsm_custom_facts_mock)
-        monkeypatch.setattr(main, "rollback_changes", rollback_changes_mock)
-        monkeypatch.setattr(report, "summary_as_json", summary_as_json_mock)
-        monkeypatch.setattr(report, "summary_as_txt", summary_as_txt_mock)
-
-        assert main.main() == 2
-        assert require_root_mock.call_count == 1
-        assert initialize_file_logging_mock.call_count == 1
-        assert toolopts_cli_mock.call_count == 1
-        assert show_eula_mock.call_count == 1
-        assert print_data_collection_mock.call_count == 1
-        assert resolve_system_info_mock.call_count == 1
-        assert collect_early_data_mock.call_count == 1
-        assert clean_yum_metadata_mock.call_count == 1
-        assert run_pre_actions_mock.call_count == 1
-        assert report_summary_mock.call_count == 1
-        assert find_actions_of_severity_mock.call_count == 1
-        assert clear_versionlock_mock.call_count == 1
-        assert finish_collection_mock.call_count == 1
-        assert should_subscribe_mock.call_count == 1
-        assert update_rhsm_custom_facts_mock.call_count == 1
-        assert rollback_changes_mock.call_count == 1
-        assert summary_as_json_mock.call_count == 1
-        assert summary_as_txt_mock.call_count == 1
-
-    def test_main_rollback_analyze_exit_phase_without_subman(self, global_tool_opts, monkeypatch, tmp_path):
-        """
-        This test is the opposite of
-        `py:test_main_rollback_analyze_exit_phase`, where we are checking the
-        case that the system needs to be registered during the analyze.
-
-        If that's the case, we don't want to call the update_rhsm_custom_facts
-        as the system will be unregistered in the end.
-        """
-        mocks = (
-            (applock, "_DEFAULT_LOCK_DIR", str(tmp_path)),
-            (utils, "require_root", mock.Mock()),
-            (main, "initialize_file_logging", mock.Mock()),
-            (toolopts, "CLI", mock.Mock()),
-            (main, "show_eula", mock.Mock()),
-            (breadcrumbs, "print_data_collection", mock.Mock()),
-            (system_info, "resolve_system_info", mock.Mock()),
-            (system_info, "print_system_information", mock.Mock()),
-            (breadcrumbs, "collect_early_data", mock.Mock()),
-            (pkghandler, "clear_versionlock", mock.Mock()),
-            (pkgmanager, "clean_yum_metadata", mock.Mock()),
-            (actions, "run_pre_actions", mock.Mock()),
-            (report, "_summary", mock.Mock()),
-            (breadcrumbs, "finish_collection", mock.Mock()),
-            (subscription, "should_subscribe", mock.Mock(side_effect=lambda: True)),
-            (subscription, "update_rhsm_custom_facts", mock.Mock()),
-            (main, "rollback_changes", mock.Mock()),
-            (report, "summary_as_json", mock.Mock()),
-            (report, "summary_as_txt", mock.Mock()),
-        )
-        global_tool_opts.activity = "analysis"
-        for module, function, value in mocks:
-            monkeypatch.setattr(module, function, value)
-
-        assert main.main() == 0
-        assert utils.require_root.call_count == 1
-        assert toolopts.CLI.call_count == 1
-        assert main.show_eula.call_count == 1
-        assert breadcrumbs.print_data_collection.call_count == 1
-        assert system_info.resolve_system_info.call_count == 1
-        assert system_info.print_system_information.call_count == 1
-        assert breadcrumbs.collect_early_data.call_count == 1
-        assert pkghandler.clear_versionlock.call_count == 1
-        assert pkgmanager.clean_yum_metadata.call_count == 1
-        assert actions.run_pre_actions.call_count == 1
-        assert report._summary.call_count == 1
-        assert breadcrumbs.finish_collection.call_count == 1
-        assert subscription.should_subscribe.call_count == 1
-        assert subscription.update_rhsm_custom_facts.call_count == 0
-        assert main.rollback_changes.call_count == 1
-        assert report.summary_as_json.call_count == 1
-        assert report.summary_as_txt.call_count == 1
-
-    def test_main_rollback_analyze_exit_phase(self, global_tool_opts, monkeypatch, tmp_path):
-        require_root_mock = mock.Mock()
-        initialize_file_logging_mock = mock.Mock()
-        toolopts_cli_mock = mock.Mock()
-        show_eula_mock = mock.Mock()
-        print_data_collection_mock = mock.Mock()
-        resolve_system_info_mock = mock.Mock()
-        print_system_information_mock = mock.Mock()
-        collect_early_data_mock = mock.Mock()
-        clean_yum_metadata_mock = mock.Mock()
-        run_pre_actions_mock = mock.Mock()
-        report_summary_mock = mock.Mock()
-        clear_versionlock_mock = mock.Mock()
-        summary_as_json_mock = mock.Mock()
-        summary_as_txt_mock = mock.Mock()
-
-        # Mock the rollback calls
-        finish_collection_mock = mock.Mock()
-        should_subscribe_mock = mock.Mock(side_effect=lambda: False)
-        update_rhsm_custom_facts_mock = mock.Mock()
-        rollback_changes_mock = mock.Mock()
-
-        monkeypatch.setattr(applock, "_DEFAULT_LOCK_DIR", str(tmp_path))
-        monkeypatch.setattr(utils, "require_root", require_root_mock)
-        monkeypatch.setattr(main, "initialize_file_logging", initialize_file_logging_mock)
-        monkeypatch.setattr(toolopts, "CLI", toolopts_cli_mock)
-        monkeypatch.setattr(main, "show_eula", show_eula_mock)
-        monkeypatch.setattr(breadcrumbs, "print_data_collection", print_data_collection_mock)
-        monkeypatch.setattr(system_info, "resolve_system_info", resolve_system_info_mock)
-        monkeypatch.setattr(system_info, "print_system_information", print_system_information_mock)
-        monkeypatch.setattr(breadcrumbs, "collect_early_data", collect_early_data_mock)
-        monkeypatch.setattr(pkghandler, "clear_versionlock", clear_versionlock_mock)
-        monkeypatch.setattr(pkgmanager, "clean_yum_metadata", clean_yum_metadata_mock)
-        monkeypatch.setattr(actions, "run_pre_actions", run_pre_actions_mock)
-        monkeypatch.setattr(report, "_summary", report_summary_mock)
-        monkeypatch.setattr(breadcrumbs, "finish_collection", finish_collection_mock)
-        monkeypatch.setattr(subscription, "should_subscribe", should_subscribe_mock)
-        monkeypatch.setattr(subscription, "update_rhsm_custom_facts", update_rhsm_custom_facts_mock)
-        monkeypatch.setattr(main, "rollback_changes", rollback_changes_mock)
-        monkeypatch.setattr(report, "summary_as_json", summary_as_json_mock)
-        monkeypatch.setattr(report, "summary_as_txt", summary_as_txt_mock)
-        global_tool_opts.activity = "analysis"
-
-        assert main.main() == 0
-        assert require_root_mock.call_count == 1
-        assert initialize_file_logging_mock.call_count == 1
-        assert toolopts_cli_mock.call_count == 1
-        assert show_eula_mock.call_count == 1
-        assert print_data_collection_mock.call_count == 1
-        assert resolve_system_info_mock.call_count == 1
-        assert collect_early_data_mock.call_count == 1
-        assert clean_yum_metadata_mock.call_count == 1
-        assert run_pre_actions_mock.call_count == 1
-        assert report_summary_mock.call_count == 1
-        assert clear_versionlock_mock.call_count == 1
-        assert finish_collection_mock.call_count == 1
-        assert should_subscribe_mock.call_count == 1
-        assert update_rhsm_custom_facts_mock.call_count == 1
-        assert rollback_changes_mock.call_count == 1
-        assert summary_as_json_mock.call_count == 1
-        assert summary_as_txt_mock.call_count == 1
-
-    def test_main_rollback_post_ponr_changes_phase(self, monkeypatch, caplog, tmp_path):
-        require_root_mock = mock.Mock()
-        initialize_file_logging_mock = mock.Mock()
-        toolopts_cli_mock = mock.Mock()
-        show_eula_mock = mock.Mock()
-        print_data_collection_mock = mock.Mock()
-        resolve_system_info_mock = mock.Mock()
-        print_system_information_mock = mock.Mock()
-        collect_early_data_mock = mock.Mock()
-        clean_yum_metadata_mock = mock.Mock()
-        run_pre_actions_mock = mock.Mock()
-        run_post_actions_mock = mock.Mock()
-        find_actions_of_severity_mock = mock.Mock(return_value=[])
-        report_summary_mock = mock.Mock()
-        clear_versionlock_mock = mock.Mock()
-        ask_to_continue_mock = mock.Mock()
-        post_ponr_conversion_mock = mock.Mock(side_effect=Exception)
-        summary_as_json_mock = mock.Mock()
-        summary_as_txt_mock = mock.Mock()
-
-        # Mock the rollback calls
-        finish_collection_mock = mock.Mock()
-        update_rhsm_custom_facts_mock = mock.Mock()
-
-        monkeypatch.setattr(applock, "_DEFAULT_LOCK_DIR", str(tmp_path))
-        monkeypatch.setattr(utils, "require_root", require_root_mock)
-        monkeypatch.setattr(main, "initialize_file_logging", initialize_file_logging_mock)
-        monkeypatch.setattr(toolopts, "CLI", toolopts_cli_mock)
-        monkeypatch.setattr(main, "show_eula", show_eula_mock)
-        monkeypatch.setattr(breadcrumbs, "print_data_collection", print_data_collection_mock)
-        monkeypatch.setattr(system_info, "resolve_system_info", resolve_system_info_mock)
-        monkeypatch.setattr(system_info, "print_system_information", print_system_information_mock)
-        monkeypatch.setattr(breadcrumbs, "collect_early_data", collect_early_data_mock)
-        monkeypatch.setattr(pkghandler, "clear_versionlock", clear_versionlock_mock)
-        monkeypatch.setattr(pkgmanager, "clean_yum_metadata", clean_yum_metadata_mock)
-        monkeypatch.setattr(actions, "run_pre_actions", run_pre_actions_mock)
-        monkeypatch.setattr(actions, "run_post_actions", run_post_actions_mock)
-        monkeypatch.setattr(actions, "find_actions_of_severity", find_actions_of_severity_mock)
-        monkeypatch.setattr(report, "_summary", report_summary_mock)
-        monkeypatch.setattr(utils, "ask_to_continue", ask_to_continue_mock)
-        monkeypatch.setattr(main, "post_ponr_conversion", post_ponr_conversion_mock)
-        monkeypatch.setattr(breadcrumbs, "finish_collection", finish_collection_mock)
-        monkeypatch.setattr(subscription, "update_rhsm_custom_facts", update_rhsm_custom_facts_mock)
-        monkeypatch.setattr(report, "summary_as_json", summary_as_json_mock)
-        monkeypatch.setattr(report, "summary_as_txt", summary_as_txt_mock)
+#: Action results with a single action that failed with the given level.
+ERROR_RESULTS = _single_action_results(
+    "One", "ERROR", "ERROR_ID", "Error", "Action error", diagnosis="User error", remediations="move on"
+)
+SKIP_RESULTS = _single_action_results(
+    "One", "SKIP", "SKIP_ID", "Skip", "Action skip", diagnosis="User skip", remediations="move on"
+)
 
-        assert main.main() == 1
-        assert require_root_mock.call_count == 1
-        assert initialize_file_logging_mock.call_count == 1
-        assert toolopts_cli_mock.call_count == 1
-        assert show_eula_mock.call_count == 1
-        assert print_data_collection_mock.call_count == 1
-        assert resolve_system_info_mock.call_count == 1
-        assert collect_early_data_mock.call_count == 1
-        assert clean_yum_metadata_mock.call_count == 1
-        assert run_pre_actions_mock.call_count == 1
-        assert run_pre_actions_mock.call_count == 1
-        assert find_actions_of_severity_mock.call_count == 1
-        assert clear_versionlock_mock.call_count == 1
-        assert report_summary_mock.call_count == 2
-        assert ask_to_continue_mock.call_count == 1
-        assert post_ponr_conversion_mock.call_count == 1
-        assert finish_collection_mock.call_count == 1
-        assert summary_as_json_mock.call_count == 1
-        assert summary_as_txt_mock.call_count == 1
-        assert "The system is left in an undetermined state that Convert2RHEL cannot fix." in caplog.records[-3].message
-        assert update_rhsm_custom_facts_mock.call_count == 1
+#: Messages of the _InhibitorsFound exception raised for each activity.
+ANALYSIS_FAILED_MSG = (
+    "The analysis process failed.\n\n"
+    "A problem was encountered during analysis and a rollback will be "
+    "initiated to restore the system as the previous state."
+)
+CONVERSION_FAILED_MSG = (
+    "The conversion process failed.\n\n"
+    "A problem was encountered during conversion and a rollback will be "
+    "initiated to restore the system as the previous state."
+)
 
 
 @pytest.mark.parametrize(
-    ("data", "exception", "match", "activity"),
+    ("data", "exception", "message", "activity"),
     (
-        (
-            {
-                "One": {
-                    "messages": [],
-                    "result": {
-                        "level": actions.STATUS_CODE["ERROR"],
-                        "id": "ERROR_ID",
-                        "title": "Error",
-                        "description": "Action error",
-                        "diagnosis": "User error",
-                        "remediations": "move on",
-                        "variables": {},
-                    },
-                },
-            },
-            main._InhibitorsFound,
-            (
-                "The analysis process failed.\n\n"
-                "A problem was encountered during analysis and a rollback will be "
-                "initiated to restore the system as the previous state."
-            ),
-            "analysis",
-        ),
-        (
-            {
-                "One": {
-                    "messages": [],
-                    "result": {
-                        "level": actions.STATUS_CODE["SKIP"],
-                        "id": "SKIP_ID",
-                        "title": "Skip",
-                        "description": "Action skip",
-                        "diagnosis": "User skip",
-                        "remediations": "move on",
-                        "variables": {},
-                    },
-                },
-            },
-            main._InhibitorsFound,
-            (
-                "The analysis process failed.\n\n"
-                "A problem was encountered during analysis and a rollback will be "
-                "initiated to restore the system as the previous state."
-            ),
-            "analysis",
-        ),
-        (
-            {
-                "One": {
-                    "messages": [],
-                    "result": {
-                        "level": actions.STATUS_CODE["SKIP"],
-                        "id": "SKIP_ID",
-                        "title": "Skip",
-                        "description": "Action skip",
-                        "diagnosis": "User skip",
-                        "remediations": "move on",
-                        "variables": {},
-                    },
-                },
-            },
-            main._InhibitorsFound,
-            (
-                "The conversion process failed.\n\n"
-                "A problem was encountered during conversion and a rollback will be "
-                "initiated to restore the system as the previous state."
-            ),
-            "conversion",
-        ),
+        (ERROR_RESULTS, main._InhibitorsFound, ANALYSIS_FAILED_MSG, "analysis"),
+        (SKIP_RESULTS, main._InhibitorsFound, ANALYSIS_FAILED_MSG, "analysis"),
+        (SKIP_RESULTS, main._InhibitorsFound, CONVERSION_FAILED_MSG, "conversion"),
     ),
+    ids=("error-analysis", "skip-analysis", "skip-conversion"),
 )
-def test_raise_for_skipped_failures(data, exception, match, activity, global_tool_opts, monkeypatch):
+def test_raise_for_skipped_failures(data, exception, message, activity, global_tool_opts, monkeypatch):
     monkeypatch.setattr(toolopts, "tool_opts", global_tool_opts)
     global_tool_opts.activity = activity
-    with pytest.raises(exception, match=match):
+    with pytest.raises(exception) as excinfo:
         main._raise_for_skipped_failures(data)
 
+    assert str(excinfo.value) == message
+
+
+@pytest.fixture(scope="session")
+def lock_dir(tmp_path_factory):
+    """
+    Directory for the tests which take the real application lock.
+
+    ApplicationLock removes its pid file when it is released, so the tests can share one directory.
+    """
+    return str(tmp_path_factory.mktemp("lock"))
+
 
-def test_main_already_running_conversion(monkeypatch, caplog, tmpdir):
+def test_main_already_running_conversion(monkeypatch, caplog, lock_dir):
     monkeypatch.setattr(toolopts, "CLI", mock.Mock())
     monkeypatch.setattr(utils, "require_root", mock.Mock())
-    monkeypatch.setattr(applock, "_DEFAULT_LOCK_DIR", str(tmpdir))
+    monkeypatch.setattr(applock, "_DEFAULT_LOCK_DIR", lock_dir)
     monkeypatch.setattr(main, "main_locked", mock.Mock(side_effect=applock.ApplicationLockedError("failed")))
 
     assert main.main() == 1
@@ -802,8 +669,8 @@ def test_main_already_running_conversion(monkeypatch, caplog, tmpdir):
 
 
 @pytest.mark.parametrize(("rollback_failures", "return_code"), ((["test-fail"], 1), ([], 2)))
-def test_handle_inhibitors_found_exception(monkeypatch, rollback_failures, return_code, global_backup_control):
-    monkeypatch.setattr(global_backup_control, "_rollback_failures", rollback_failures)
+def test_handle_inhibitors_found_exception(rollback_failures, return_code, global_backup_control):
+    global_backup_control._rollback_failures = rollback_failures
 
     ret = main._handle_inhibitors_found_exception()
 
@@ -17,7 +17,7 @@ def test_check_user_response_user_and_password(convert2rhel):
         # when the input is empty, hence the '0' index.
         # In case the loop doesn't work, the prompt returns
         # "Password" and raises the assertion error.
-        assert c2r.expect("Username", timeout=300) == 0
+        assert c2r.expect(["Username", "Password"], timeout=300) == 0
         # Provide username, expect password prompt
 
         retries = 0
@@ -1,7 +1,3 @@
-from __future__ import print_function
-
-import fileinput
-
 import pytest
 
 from conftest import TEST_VARS
@@ -27,14 +23,16 @@ def test_modify_grub_valid(convert2rhel):
     block_comment = "\n# comment added by test\n"
     inline_comment_post = "# comment added by test"
     whitespace = "     "
-    for line in fileinput.FileInput("/etc/default/grub", inplace=True):
+    with open("/etc/default/grub") as grub_file:
+        lines = grub_file.readlines()
+
+    for index, line in enumerate(lines):
         if target_line in line:
             line = line.replace("\n", "")
-            line = line.replace(
-                line,
-                block_comment + whitespace + line + whitespace + inline_comment_post + block_comment + "\n",
-            )
-        print(line, end="")
+            lines[index] = block_comment + whitespace + line + whitespace + inline_comment_post + block_comment + "\n"
+
+    with open("/etc/default/grub", "w") as grub_file:
+        grub_file.writelines(lines)
 
     with convert2rhel(
         "-y --serverurl {} --username {} --password {} --pool {} --debug".format(